@@ -0,0 +1,99 @@
+
+import pygame
+import time
+from collections import OrderedDict
+from game.constants import *
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class AssetManager:
+
+    def __init__(self, max_scaled=ASSET_SCALED_CACHE_SIZE):
+        self.images = {}
+        self.failed = {}
+        self.scaled_images = OrderedDict()
+        self.max_scaled = max_scaled
+        self.load_times = {}
+
+    def image(self, path):
+        image = self.images.get(path)
+        if image is not None:
+            return image
+        if path in self.failed:
+            raise pygame.error(self.failed[path])
+
+        start = time.perf_counter()
+        try:
+            image = pygame.image.load(path)
+        except Exception as e:
+            self.failed[path] = str(e)
+            raise
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        elif not image.get_flags() & pygame.SRCALPHA:
+            # Без окна convert_alpha недоступен, но альфа нужна всё равно: иначе углы повёрнутой
+            # непрозрачной картинки станут сплошными и маска коллизии разойдётся с обычной игрой
+            converted = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            converted.blit(image, (0, 0))
+            image = converted
+        self.load_times[path] = time.perf_counter() - start
+
+        self.images[path] = image
+        return image
+
+    def scaled(self, path, size):
+        key = (path, size)
+        image = self.scaled_images.get(key)
+        if image is not None:
+            self.scaled_images.move_to_end(key)
+            return image
+
+        image = pygame.transform.scale(self.image(path), size)
+        self.scaled_images[key] = image
+        while len(self.scaled_images) > self.max_scaled:
+            self.scaled_images.popitem(last=False)
+        return image
+
+    def release(self, path):
+        self.images.pop(path, None)
+
+    def preload(self, manifest=ASSET_MANIFEST):
+        start = time.perf_counter()
+        for path, sizes in manifest.items():
+            try:
+                for size in sizes:
+                    self.scaled(path, size)
+                if sizes:
+                    self.release(path)
+                else:
+                    self.image(path)
+            except Exception as e:
+                print(f"⚠️ Не удалось загрузить {path}: {e}")
+
+        stats = self.stats()
+        print(f"🖼️ Загружено изображений: {stats['images']} за {(time.perf_counter() - start) * 1000:.0f} мс, "
+              f"{stats['memory'] // 1024} КБ")
+
+    def stats(self):
+        memory = sum(surface_bytes(image) for image in self.images.values())
+        memory += sum(surface_bytes(image) for image in self.scaled_images.values())
+        return {
+            "images": len(self.images),
+            "scaled": len(self.scaled_images),
+            "failed": len(self.failed),
+            "load_time": sum(self.load_times.values()),
+            "memory": memory,
+        }
+
+
+_asset_manager = None
+
+
+def get_assets():
+    global _asset_manager
+    if _asset_manager is None:
+        _asset_manager = AssetManager()
+    return _asset_manager
@@ -0,0 +1,199 @@
+
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import numpy as np
+
+from game.headless import init_headless
+
+import pygame
+from game.constants import *
+from game.game_manager import GameManager
+from game.effects import ParticleSystem, BackgroundStars, RainbowEffect, ScoreEffect
+from game.entities.flappy_barbie import FlappyBarbie
+from game.entities.coin import Coin
+from game.world.pipes import Pipe
+from game.profiler import percentile
+from game.stamp_cache import get_stamp_cache
+from game.sound_generator import synthesize_beep, encode_pcm
+
+
+DT = 1.0 / TICK_RATE
+
+
+class BenchmarkCase:
+
+    def __init__(self, name, run, prepare=None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    to_ms = 1000.0
+    return {
+        "iterations": len(samples),
+        "mean_ms": sum(samples) / len(samples) * to_ms,
+        "p50_ms": percentile(ordered, 50) * to_ms,
+        "p95_ms": percentile(ordered, 95) * to_ms,
+        "p99_ms": percentile(ordered, 99) * to_ms,
+        "min_ms": ordered[0] * to_ms,
+        "max_ms": ordered[-1] * to_ms,
+    }
+
+
+def time_case(case, iterations, warmup):
+    for _ in range(warmup):
+        if case.prepare:
+            case.prepare()
+        case.run()
+
+    stamps = get_stamp_cache()
+    misses_before = stamps.misses
+    samples = []
+    for _ in range(iterations):
+        if case.prepare:
+            case.prepare()
+        start = time.perf_counter()
+        case.run()
+        samples.append(time.perf_counter() - start)
+
+    result = summarize(samples)
+    result["stamp_misses"] = stamps.misses - misses_before
+    return result
+
+
+def build_cases(screen):
+    game_manager = GameManager(screen, headless=True)
+    menu = game_manager.states[GAME_STATE_MENU]
+    game_over = game_manager.states[GAME_STATE_GAME_OVER]
+    game_manager.change_state(GAME_STATE_PLAYING)
+    playing = game_manager.states[GAME_STATE_PLAYING]
+
+    particles = ParticleSystem()
+    many_particles = ParticleSystem(PARTICLE_QUALITY_LEVELS[-1])
+    stars = BackgroundStars()
+    rainbow = RainbowEffect()
+    score_effect = ScoreEffect()
+
+    def refill_score_effects():
+        if score_effect.active_count() < 3:
+            score_effect.create_effect(SCREEN_WIDTH // 2, 100, 1)
+
+    pipe = Pipe(SCREEN_WIDTH // 2)
+    while pipe.top_height <= 0 or pipe.bottom_height <= 0:
+        pipe = Pipe(SCREEN_WIDTH // 2)
+
+    def rewind_pipe():
+        if pipe.x < -pipe.width:
+            pipe.x = pipe.prev_x = SCREEN_WIDTH
+
+    coin = Coin(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    barbie = FlappyBarbie(100, BARBIE_START_Y)
+
+    def keep_barbie_flying():
+        if not barbie.is_alive or barbie.y > BARBIE_START_Y:
+            if not barbie.is_alive:
+                barbie.reset()
+            barbie.velocity_y = FLAP_STRENGTH
+
+    def menu_tab(tab):
+        def prepare():
+            menu.current_tab = tab
+        return prepare
+
+    cases = [
+        BenchmarkCase("ParticleSystem.update", lambda: particles.update(DT)),
+        BenchmarkCase("ParticleSystem.render", lambda: particles.render(screen)),
+        BenchmarkCase(f"ParticleSystem.update[{many_particles.count}]", lambda: many_particles.update(DT)),
+        BenchmarkCase(f"ParticleSystem.render[{many_particles.count}]", lambda: many_particles.render(screen)),
+        BenchmarkCase("BackgroundStars.update", lambda: stars.update(DT)),
+        BenchmarkCase("BackgroundStars.render", lambda: stars.render(screen)),
+        BenchmarkCase("RainbowEffect.update", lambda: rainbow.update(DT)),
+        BenchmarkCase("RainbowEffect.render", lambda: rainbow.render(screen)),
+        BenchmarkCase("ScoreEffect.update", lambda: score_effect.update(DT), refill_score_effects),
+        BenchmarkCase("ScoreEffect.render", lambda: score_effect.render(screen), refill_score_effects),
+        BenchmarkCase("Pipe.update", lambda: pipe.update(DT), rewind_pipe),
+        BenchmarkCase("Pipe.render", lambda: pipe.render(screen), rewind_pipe),
+        BenchmarkCase("Coin.update", lambda: coin.update(DT)),
+        BenchmarkCase("Coin.render", lambda: coin.render(screen)),
+        BenchmarkCase("FlappyBarbie.update", lambda: barbie.update(DT), keep_barbie_flying),
+        BenchmarkCase("FlappyBarbie.render", lambda: barbie.render(screen), keep_barbie_flying),
+        BenchmarkCase("PlayingState._render_ground", lambda: playing._render_ground(screen)),
+        BenchmarkCase("synthesize_beep[death]", lambda: encode_pcm(
+            synthesize_beep(*SOUND_EFFECTS["death"], MIXER_FREQUENCY), MIXER_SIZE, MIXER_CHANNELS)),
+    ]
+    for tab, tab_name in enumerate(menu.tabs):
+        cases.append(BenchmarkCase(f"MenuState.render[{tab_name}]", lambda: menu.render(screen), menu_tab(tab)))
+    cases.append(BenchmarkCase("GameOverState.render", lambda: game_over.render(screen)))
+
+    return cases
+
+
+def print_results(results, baseline=None):
+    print(f"{'case':40} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, stats in results.items():
+        line = (f"{name:40} {stats['mean_ms']:9.3f} {stats['p50_ms']:9.3f} "
+                f"{stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f}")
+        if baseline and name in baseline and baseline[name]["p50_ms"] > 0:
+            change = stats["p50_ms"] / baseline[name]["p50_ms"] - 1
+            line += f" {change * 100:+7.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Микробенчмарки игровых подсистем в 1920x1080")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--filter", default="", help="запускать только случаи с этой подстрокой")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="JSON прошлого прогона для сравнения p50")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    init_headless()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    for case in build_cases(screen):
+        if args.filter and args.filter not in case.name:
+            continue
+        results[case.name] = time_case(case, args.iterations, args.warmup)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f).get("results", {})
+    print_results(results, baseline)
+
+    report = {
+        "meta": {
+            "resolution": [SCREEN_WIDTH, SCREEN_HEIGHT],
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"📊 Результаты сохранены в {args.output}")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
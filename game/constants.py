@@ -2,15 +2,80 @@
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 FPS = 60
+
+# Профилировщик кадра (F3 - показать/скрыть)
+PROFILER_HISTORY = 180
+PROFILER_COLUMN_WIDTH = 2
+PROFILER_GRAPH_HEIGHT = 120
+PROFILER_MS_PER_PIXEL = 0.25
+PROFILER_TEXT_INTERVAL = 15
+
+# Фиксированный шаг симуляции: игра тикает с TICK_RATE, рисуется с RENDER_FPS
+TICK_RATE = 60
+RENDER_FPS = FPS
+MAX_CATCHUP_STEPS = 5
+MAX_FRAME_TIME = 0.25
 GAME_TITLE = "Flappy Barbie - Pink Dreams 💗"
 
 FULLSCREEN = False
 RESIZABLE = True
 
+# Вывод кадра на экран (F10 - переключить режим)
+PRESENT_DIRECT = "direct"
+PRESENT_INTEGER = "integer"
+PRESENT_SMOOTH = "smooth"
+PRESENT_SCALED = "scaled"
+PRESENT_MODES = [PRESENT_SMOOTH, PRESENT_INTEGER, PRESENT_DIRECT, PRESENT_SCALED]
+PRESENT_MODE = PRESENT_SMOOTH
+
 SOUND_ENABLED = True
 MUSIC_VOLUME = 0.3
+
+# Процедурная музыка: поток синтезирует короткие куски, игра ставит их в очередь своего канала
+MUSIC_ENABLED = True
+MUSIC_CHANNEL = 0
+MUSIC_CHUNK_SECONDS = 0.25
+MUSIC_QUEUE_CHUNKS = 4
+MUSIC_PUMP_INTERVAL = 50  # мс, как часто подкладывать куски во время блокирующих пауз
+MUSIC_BPM = 96
+MUSIC_STEPS_PER_BAR = 8
+MUSIC_PATTERN_BARS = 2
+MUSIC_REST_CHANCE = 0.3
+MUSIC_ROOT_FREQUENCY = 261.63
+MUSIC_SEED = 7
 SFX_VOLUME = 0.5
 
+# Эффекты синтезируются один раз и хранятся готовым PCM в формате микшера
+SOUND_CACHE_DIR = ".sound_cache"
+MIXER_FREQUENCY = 22050
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 512
+MIXER_NUM_CHANNELS = 16
+
+# Свои каналы у каждой категории эффектов (сразу за музыкальным), чтобы взмахи не глушили важные звуки
+SOUND_CHANNEL_GROUPS = {"player": 2, "reward": 3, "ui": 2}
+SOUND_RESERVED_CHANNELS = MUSIC_CHANNEL + 1 + sum(SOUND_CHANNEL_GROUPS.values())
+SOUND_ROUTING = {
+    # имя: (категория, приоритет) - более важный звук может занять канал менее важного
+    "flap": ("player", 0),
+    "death": ("player", 3),
+    "score": ("reward", 1),
+    "levelup": ("reward", 2),
+    "menu_move": ("ui", 0),
+    "menu_select": ("ui", 1),
+}
+SOUND_COALESCE_WINDOW = 0.05  # повтор того же звука быстрее этого склеивается с предыдущим, с
+SOUND_EFFECTS = {
+    # имя: (частота, длительность, громкость)
+    "flap": (330, 0.08, 0.4),
+    "score": (523, 0.15, 0.5),
+    "death": (165, 0.4, 0.5),
+    "levelup": (659, 0.25, 0.6),
+    "menu_select": (440, 0.1, 0.4),
+    "menu_move": (330, 0.05, 0.3),
+}
+
 # Цвета (RGB) - Розовая палитра!
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -35,9 +100,13 @@ PIPE_SPEED = 350
 PIPE_GAP = 400
 PIPE_SPACING = 700
 PIPE_WIDTH = 180
+SWEEP_SAMPLE_STEP = 4  # шаг проверки маской вдоль пути за тик, пиксели
 
 BARBIE_SIZE = 100
 BARBIE_ROTATION_SPEED = 3
+BARBIE_MIN_ROTATION = -90
+BARBIE_MAX_ROTATION = 25
+BARBIE_ROTATION_STEP = 2
 
 GAME_STATE_MENU = "menu"
 GAME_STATE_PLAYING = "playing"
@@ -46,18 +115,35 @@ GAME_STATE_GAME_OVER = "game_over"
 GAME_STATE_WIN = "win"
 
 GROUND_HEIGHT = 150
+GROUND_HEART_SPACING = 100  # период узора земли, полоса шире экрана на один период
+GROUND_SCROLL = True  # земля едет вместе с трубами
 BARBIE_START_Y = 540
 
 # Эффекты и частицы (СУПЕР МЕГА ПРАЙМ ДИЗАЙН!)
-PARTICLE_COUNT = 80
+PARTICLE_COUNT = 80  # значение по умолчанию, меняется в настройках
+PARTICLE_QUALITY_LEVELS = [0, 40, 80, 500, 2000, 5000]
 TRAIL_LENGTH = 15
+TRAIL_CAPACITY = 60
 STAR_COUNT = 50
 SPARKLE_INTERVAL = 0.1
+SPARKLE_CAPACITY = 16  # искра живёт до 0.6 с, одновременно их не больше 7
+SCORE_BURST_PARTICLES = 20
+SCORE_BURST_CAPACITY = 160  # частиц в пуле вспышек счёта, старые вспышки перезаписываются
+
+# Кэш готовых штампов (звёзды, искры, частицы)
+STAMP_CACHE_SIZE = 1024
+STAMP_ALPHA_STEP = 8
+
+# Кэш отрендеренного текста
+TEXT_CACHE_SIZE = 256
+TEXT_ALPHA_STEP = 16
 
 COIN_SIZE = 60
 COIN_SPAWN_CHANCE = 0.3
 COINS_PER_SCORE = 1
 COIN_COLLECT_RADIUS = 80
+COIN_SPIN_FRAMES = 24
+COIN_GLOW_FRAMES = 16
 
 SKINS = {
     "default": {"name": "Классическая Барби", "price": 0, "file": None},
@@ -76,3 +162,21 @@ LOCATIONS = {
     "galaxy": {"name": "Космос", "price": 400, "colors": [(10, 10, 50), (75, 0, 130)]},
     "candy": {"name": "Конфетная страна", "price": 600, "colors": [(255, 182, 193), (255, 228, 225)]}
 }
+
+# Изображения, которые загружаются заранее при старте (путь -> размеры копий).
+# Если размеры указаны, в памяти остаются только уменьшенные копии
+IMAGES_DIR = "assets/images"
+ASSET_MANIFEST = {
+    f"{IMAGES_DIR}/barbi.gif": [],
+    f"{IMAGES_DIR}/money.png": [(COIN_SIZE, COIN_SIZE)],
+    f"{IMAGES_DIR}/closet.png": [],
+}
+for _skin in SKINS.values():
+    if _skin["file"]:
+        ASSET_MANIFEST[f"{IMAGES_DIR}/{_skin['file']}"] = [(BARBIE_SIZE, BARBIE_SIZE)]
+ASSET_SCALED_CACHE_SIZE = 256
+
+# Градиентные фоны: меню и экран проигрыша используют общую пару цветов
+MENU_GRADIENT = [(255, 192, 203), (155, 92, 153)]
+# Места хватает на фон каждой локации и градиент меню, чтобы смена локаций ничего не вытесняла
+GRADIENT_CACHE_SIZE = len(LOCATIONS) + 1
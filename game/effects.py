@@ -2,50 +2,113 @@
 import pygame
 import random
 import math
+import numpy as np
 from game.constants import *
+from game.stamp_cache import get_stamp_cache
+from game.text_cache import get_text_cache
+
+
+class CircleBatch:
+
+    def __init__(self, colors, max_radius):
+        self.colors = colors
+        self.max_radius = max_radius
+        # Штампы по коду (радиус, цвет, уровень альфы), чтобы рендер не ходил в кэш за каждой частицей
+        self.alpha_step = get_stamp_cache().alpha_step
+        self.alpha_levels = 255 // self.alpha_step + 2
+        self.stamps = np.full((max_radius + 1) * len(colors) * self.alpha_levels, None, dtype=object)
+
+    def blit(self, screen, pos, radius, color, alpha):
+        level = ((alpha / self.alpha_step) + 0.5).astype(np.int32)
+        visible = (radius > 0) & (level > 0)
+        if not visible.any():
+            return
+        radius = np.minimum(radius[visible], self.max_radius)
+        color = color[visible]
+        level = level[visible]
+
+        codes = (radius * len(self.colors) + color) * self.alpha_levels + level
+        surfaces = self.stamps[codes]
+        missing = np.flatnonzero(np.equal(surfaces, None))
+        if len(missing):
+            stamps = get_stamp_cache()
+            for i in missing:
+                code = codes[i]
+                if self.stamps[code] is None:
+                    self.stamps[code] = stamps.circle(int(radius[i]), self.colors[color[i]],
+                                                      int(level[i]) * self.alpha_step)
+            surfaces = self.stamps[codes]
+
+        dest = pos[visible].astype(np.int32)
+        dest -= radius[:, None]
+        screen.blits(zip(surfaces.tolist(), dest.tolist()), False)
 
 
 class ParticleSystem:
 
-    def __init__(self):
-        self.particles = []
-        self._create_particles()
-
-    def _create_particles(self):
-        for _ in range(PARTICLE_COUNT):
-            particle = {
-                'x': random.randint(0, SCREEN_WIDTH),
-                'y': random.randint(0, SCREEN_HEIGHT - GROUND_HEIGHT),
-                'speed': random.uniform(10, 30),
-                'size': random.randint(1, 3),
-                'color': random.choice([LIGHT_PINK, WHITE, GOLD, PURPLE]),
-                'alpha': random.randint(50, 150),
-                'pulse': random.uniform(0, math.pi * 2)
-            }
-            self.particles.append(particle)
+    COLORS = (LIGHT_PINK, WHITE, GOLD, PURPLE)
+    MAX_SIZE = 3
+
+    def __init__(self, count=PARTICLE_COUNT):
+        self.count = 0
+        self.pos = np.empty((0, 2), dtype=np.float32)
+        self.vel = np.empty((0, 2), dtype=np.float32)
+        self.pulse = np.empty(0, dtype=np.float32)
+        self.size = np.empty(0, dtype=np.int32)
+        self.color = np.empty(0, dtype=np.int32)
+        self.alpha = np.empty(0, dtype=np.int32)
+        self.batch = CircleBatch(self.COLORS, self.MAX_SIZE)
+
+        self.set_count(count)
+
+    def set_count(self, count):
+        count = max(0, int(count))
+        if count < self.count:
+            self.pos = self.pos[:count].copy()
+            self.vel = self.vel[:count].copy()
+            self.pulse = self.pulse[:count].copy()
+            self.size = self.size[:count].copy()
+            self.color = self.color[:count].copy()
+            self.alpha = self.alpha[:count].copy()
+        elif count > self.count:
+            extra = count - self.count
+            pos = np.empty((extra, 2), dtype=np.float32)
+            pos[:, 0] = np.random.randint(0, SCREEN_WIDTH + 1, extra)
+            pos[:, 1] = np.random.randint(0, SCREEN_HEIGHT - GROUND_HEIGHT + 1, extra)
+            vel = np.zeros((extra, 2), dtype=np.float32)
+            vel[:, 0] = -np.random.uniform(10, 30, extra)
+
+            self.pos = np.concatenate((self.pos, pos))
+            self.vel = np.concatenate((self.vel, vel))
+            self.pulse = np.concatenate((self.pulse, np.random.uniform(0, math.pi * 2, extra).astype(np.float32)))
+            self.size = np.concatenate((self.size, np.random.randint(1, self.MAX_SIZE + 1, extra).astype(np.int32)))
+            self.color = np.concatenate((self.color, np.random.randint(0, len(self.COLORS), extra).astype(np.int32)))
+            self.alpha = np.concatenate((self.alpha, np.random.randint(50, 151, extra).astype(np.int32)))
+        self.count = count
 
     def update(self, dt):
-        for particle in self.particles:
-            particle['x'] -= particle['speed'] * dt
+        if not self.count:
+            return
+
+        self.pos += self.vel * dt
 
-            particle['pulse'] += dt * 2
-            if particle['pulse'] > 2 * math.pi:
-                particle['pulse'] = 0
+        self.pulse += dt * 2
+        self.pulse[self.pulse > 2 * math.pi] = 0
 
-            if particle['x'] < -10:
-                particle['x'] = SCREEN_WIDTH + 10
-                particle['y'] = random.randint(0, SCREEN_HEIGHT - GROUND_HEIGHT)
+        wrapped = self.pos[:, 0] < -10
+        respawned = int(np.count_nonzero(wrapped))
+        if respawned:
+            self.pos[wrapped, 0] = SCREEN_WIDTH + 10
+            self.pos[wrapped, 1] = np.random.randint(0, SCREEN_HEIGHT - GROUND_HEIGHT + 1, respawned)
 
     def render(self, screen):
-        for particle in self.particles:
-            pulse = abs(math.sin(particle['pulse']))
-            alpha = int(particle['alpha'] * pulse)
-            size = int(particle['size'] * (0.5 + 0.5 * pulse))
+        if not self.count:
+            return
 
-            particle_surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            color = (*particle['color'][:3], alpha)
-            pygame.draw.circle(particle_surf, color, (size, size), size)
-            screen.blit(particle_surf, (int(particle['x']) - size, int(particle['y']) - size))
+        pulse = np.abs(np.sin(self.pulse))
+        size = (self.size * (0.5 + 0.5 * pulse)).astype(np.int32)
+        alpha = (self.alpha * pulse).astype(np.int32)
+        self.batch.blit(screen, self.pos, size, self.color, alpha)
 
 
 class BackgroundStars:
@@ -72,40 +135,79 @@ class BackgroundStars:
                 star['twinkle'] = 0
 
     def render(self, screen):
+        stamps = get_stamp_cache()
         for star in self.stars:
             brightness = abs(math.sin(star['twinkle']))
             alpha = int(255 * brightness)
             size = star['size']
 
             x, y = int(star['x']), int(star['y'])
-            points = []
-            for i in range(10):
-                angle = i * 36 * math.pi / 180
-                r = size if i % 2 == 0 else size // 2
-                px = x + int(r * math.cos(angle))
-                py = y + int(r * math.sin(angle))
-                points.append((px, py))
-
-            star_surf = pygame.Surface((size*3, size*3), pygame.SRCALPHA)
-            offset_points = [(p[0] - x + size*1.5, p[1] - y + size*1.5) for p in points]
-            if len(offset_points) >= 3:
-                pygame.draw.polygon(star_surf, (*GOLD, alpha), offset_points)
+            star_surf = stamps.star(size, GOLD, alpha, 5)
             screen.blit(star_surf, (x - size*1.5, y - size*1.5))
 
 
 class RainbowEffect:
 
+    STRIPE_HEIGHT = 3
+    WAVE_HEIGHT = 5
+    COLORS = [
+        (255, 0, 0),
+        (255, 127, 0),
+        (255, 255, 0),
+        (0, 255, 0),
+        (0, 0, 255),
+        (75, 0, 130),
+        (148, 0, 211)
+    ]
+    _band = None
+
     def __init__(self):
         self.offset = 0
-        self.colors = [
-            (255, 0, 0),
-            (255, 127, 0),
-            (255, 255, 0),
-            (0, 255, 0),
-            (0, 0, 255),
-            (75, 0, 130),
-            (148, 0, 211)
-        ]
+        RainbowEffect.preload()
+
+    @classmethod
+    def preload(cls):
+        # Запекание занимает ~85 мс, поэтому main вызывает его при старте вместе с картинками
+        if cls._band is None:
+            cls._band = cls._bake_band()
+
+    @classmethod
+    def _bake_band(cls):
+        # Полоса шириной в два экрана: рисуем волну так же, как раньше, поверх
+        # чёрного и белого фона и по разнице восстанавливаем цвет и прозрачность
+        width = SCREEN_WIDTH * 2 + 2
+        height = len(cls.COLORS) * cls.STRIPE_HEIGHT + cls.WAVE_HEIGHT * 2
+
+        on_black = pygame.Surface((width, height))
+        on_black.fill(BLACK)
+        on_white = pygame.Surface((width, height))
+        on_white.fill(WHITE)
+
+        for i, color in enumerate(cls.COLORS):
+            y = i * cls.STRIPE_HEIGHT + cls.WAVE_HEIGHT
+            stripe = pygame.Surface((2, cls.STRIPE_HEIGHT), pygame.SRCALPHA)
+            stripe.fill((*color, 100))
+            for x in range(width):
+                wave_offset = int(cls.WAVE_HEIGHT * math.sin(x * 0.02))
+                on_black.blit(stripe, (x, y + wave_offset))
+                on_white.blit(stripe, (x, y + wave_offset))
+
+        black = pygame.surfarray.array3d(on_black).astype(np.float32)
+        white = pygame.surfarray.array3d(on_white).astype(np.float32)
+        alpha = np.clip(255 - (white - black).mean(axis=2), 0, 255)
+        color = np.clip(black * 255 / np.maximum(alpha, 1)[..., None], 0, 255)
+
+        band = pygame.Surface((width, height), pygame.SRCALPHA)
+        pixels = pygame.surfarray.pixels3d(band)
+        pixels[...] = np.rint(color).astype(np.uint8)
+        del pixels
+        pixels_alpha = pygame.surfarray.pixels_alpha(band)
+        pixels_alpha[...] = np.rint(alpha).astype(np.uint8)
+        del pixels_alpha
+
+        if pygame.display.get_surface() is not None:
+            band = band.convert_alpha()
+        return band
 
     def update(self, dt):
         self.offset += dt * 50
@@ -113,72 +215,76 @@ class RainbowEffect:
             self.offset = 0
 
     def render(self, screen):
-        stripe_height = 3
-        for i, color in enumerate(self.colors):
-            y = i * stripe_height
-            for x in range(SCREEN_WIDTH):
-                wave_offset = int(5 * math.sin((x + self.offset) * 0.02))
-                alpha = 100
-                surf = pygame.Surface((2, stripe_height), pygame.SRCALPHA)
-                surf.fill((*color, alpha))
-                screen.blit(surf, (x, y + wave_offset))
+        band = RainbowEffect._band
+        start_x = min(int(self.offset), band.get_width() - SCREEN_WIDTH)
+        screen.blit(band, (0, -self.WAVE_HEIGHT), (start_x, 0, SCREEN_WIDTH, band.get_height()))
 
 
 class ScoreEffect:
 
-    def __init__(self):
-        self.active_effects = []
+    COLORS = (GOLD, HOT_PINK, LIGHT_PINK, PURPLE)
+    PARTICLE_RADIUS = 3
 
-    def create_effect(self, x, y, score):
-        effect = {
-            'x': x,
-            'y': y,
-            'life': 1.0,
-            'score': score,
-            'particles': []
-        }
-
-        for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'color': random.choice([GOLD, HOT_PINK, LIGHT_PINK, PURPLE])
-            }
-            effect['particles'].append(particle)
+    def __init__(self, capacity=SCORE_BURST_CAPACITY):
+        # Пул заранее выделен: новая вспышка занимает место самой старой, память во время игры не растёт
+        self.capacity = max(SCORE_BURST_PARTICLES, capacity - capacity % SCORE_BURST_PARTICLES)
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.life = np.zeros(self.capacity, dtype=np.float32)
+        self.color = np.zeros(self.capacity, dtype=np.int32)
+        self.head = 0
 
-        self.active_effects.append(effect)
+        self.effect_capacity = self.capacity // SCORE_BURST_PARTICLES
+        self.effect_pos = np.zeros((self.effect_capacity, 2), dtype=np.float32)
+        self.effect_life = np.zeros(self.effect_capacity, dtype=np.float32)
+        self.effect_head = 0
 
-    def update(self, dt):
-        for effect in self.active_effects[:]:
-            effect['life'] -= dt
+        self.batch = CircleBatch(self.COLORS, self.PARTICLE_RADIUS)
+
+    def active_count(self):
+        return int(np.count_nonzero(self.effect_life > 0))
 
-            for particle in effect['particles']:
-                particle['x'] += particle['vx'] * dt
-                particle['y'] += particle['vy'] * dt
-                particle['vy'] += 200 * dt
+    def create_effect(self, x, y, score):
+        slot = self.effect_head
+        self.effect_pos[slot] = (x, y)
+        self.effect_life[slot] = 1.0
+        self.effect_head = (slot + 1) % self.effect_capacity
+
+        # Вспышки одинаковой длины, поэтому кольцо всегда перезаписывает самые старые частицы
+        burst = slice(self.head, self.head + SCORE_BURST_PARTICLES)
+        angle = np.random.uniform(0, 2 * math.pi, SCORE_BURST_PARTICLES)
+        speed = np.random.uniform(50, 150, SCORE_BURST_PARTICLES)
+        self.pos[burst] = (x, y)
+        self.vel[burst, 0] = np.cos(angle) * speed
+        self.vel[burst, 1] = np.sin(angle) * speed
+        self.life[burst] = 1.0
+        self.color[burst] = np.random.randint(0, len(self.COLORS), SCORE_BURST_PARTICLES)
+        self.head = (self.head + SCORE_BURST_PARTICLES) % self.capacity
+
+    def update(self, dt):
+        if self.effect_life.max() <= 0:
+            return
+        self.effect_life -= dt
 
-            if effect['life'] <= 0:
-                self.active_effects.remove(effect)
+        self.pos += self.vel * dt
+        self.vel[:, 1] += 200 * dt
+        self.life -= dt
 
     def render(self, screen):
-        for effect in self.active_effects:
-            alpha = int(255 * effect['life'])
-
-            font = pygame.font.Font(None, 120)
-            text = font.render("+1", True, GOLD)
-            text.set_alpha(alpha)
-            y_offset = int((1 - effect['life']) * 50)
-            screen.blit(text, (int(effect['x']) - 20, int(effect['y']) - y_offset))
-
-            for particle in effect['particles']:
-                size = int(3 * effect['life'])
-                if size > 0:
-                    particle_surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                    pygame.draw.circle(particle_surf, (*particle['color'], alpha),
-                                     (size, size), size)
-                    screen.blit(particle_surf,
-                              (int(particle['x']) - size, int(particle['y']) - size))
+        text_cache = get_text_cache()
+        for slot in np.flatnonzero(self.effect_life > 0):
+            life = float(self.effect_life[slot])
+            alpha = int(255 * life)
+
+            text = text_cache.render("+1", 120, GOLD, alpha)
+            y_offset = int((1 - life) * 50)
+            x, y = self.effect_pos[slot]
+            screen.blit(text, (int(x) - 20, int(y) - y_offset))
+
+        alive = self.life > 0
+        if not alive.any():
+            return
+        life = self.life[alive]
+        radius = (self.PARTICLE_RADIUS * life).astype(np.int32)
+        alpha = (255 * life).astype(np.int32)
+        self.batch.blit(screen, self.pos[alive], radius, self.color[alive], alpha)
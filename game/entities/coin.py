@@ -2,28 +2,61 @@
 import pygame
 import random
 import math
+from collections import deque
 from game.constants import *
 from game.sound_generator import play_sound
+from game.assets import get_assets
 
 
 class Coin:
 
+    SPIN_PERIOD = math.pi
+    GLOW_PERIOD = math.pi / 2
+    _spin_frames = None
+    _glow_frames = None
+
+    __slots__ = ("x", "y", "collected", "animation_time", "bob_offset")
+
     def __init__(self, x, y):
+        self.reset(x, y)
+
+        if Coin._spin_frames is None:
+            Coin._bake_frames()
+
+    def reset(self, x, y):
         self.x = x
         self.y = y
         self.collected = False
         self.animation_time = 0
         self.bob_offset = random.uniform(0, math.pi * 2)
 
+    @classmethod
+    def _bake_frames(cls):
         try:
-            self.image = pygame.image.load("assets/images/money.png").convert_alpha()
-            self.image = pygame.transform.scale(self.image, (COIN_SIZE, COIN_SIZE))
+            image = get_assets().scaled(f"{IMAGES_DIR}/money.png", (COIN_SIZE, COIN_SIZE))
         except:
-            self.image = pygame.Surface((COIN_SIZE, COIN_SIZE), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, GOLD, (COIN_SIZE//2, COIN_SIZE//2), COIN_SIZE//2)
-            pygame.draw.circle(self.image, (255, 255, 0), (COIN_SIZE//2, COIN_SIZE//2), COIN_SIZE//2 - 5, 3)
+            image = pygame.Surface((COIN_SIZE, COIN_SIZE), pygame.SRCALPHA)
+            pygame.draw.circle(image, GOLD, (COIN_SIZE//2, COIN_SIZE//2), COIN_SIZE//2)
+            pygame.draw.circle(image, (255, 255, 0), (COIN_SIZE//2, COIN_SIZE//2), COIN_SIZE//2 - 5, 3)
+
+        # Кадры вращения и свечения на один период анимации, общие для всех монет
+        cls._spin_frames = []
+        for i in range(COIN_SPIN_FRAMES):
+            t = (i + 0.5) / COIN_SPIN_FRAMES * cls.SPIN_PERIOD
+            scale = abs(math.sin(t)) * 0.3 + 0.7
+            scaled_width = int(COIN_SIZE * scale)
+            cls._spin_frames.append((pygame.transform.scale(image, (scaled_width, COIN_SIZE)), scaled_width // 2))
 
-        self.original_image = self.image.copy()
+        cls._glow_frames = []
+        for i in range(COIN_GLOW_FRAMES):
+            t = (i + 0.5) / COIN_GLOW_FRAMES * cls.GLOW_PERIOD
+            glow_surf = pygame.Surface((COIN_SIZE + 20, COIN_SIZE + 20), pygame.SRCALPHA)
+            glow_alpha = int(abs(math.sin(t * 2)) * 100 + 50)
+            pygame.draw.circle(glow_surf, (*GOLD[:3], glow_alpha),
+                             (COIN_SIZE//2 + 10, COIN_SIZE//2 + 10), COIN_SIZE//2 + 10)
+            if pygame.display.get_surface() is not None:
+                glow_surf = glow_surf.convert_alpha()
+            cls._glow_frames.append(glow_surf)
 
     def update(self, dt):
         if not self.collected:
@@ -35,53 +68,72 @@ class Coin:
         if not self.collected:
             bob_y = math.sin(self.bob_offset) * 10
 
-            scale = abs(math.sin(self.animation_time)) * 0.3 + 0.7
-            scaled_width = int(COIN_SIZE * scale)
-            scaled_image = pygame.transform.scale(self.original_image, (scaled_width, COIN_SIZE))
+            spin_index = int(self.animation_time % self.SPIN_PERIOD / self.SPIN_PERIOD * COIN_SPIN_FRAMES)
+            scaled_image, half_width = Coin._spin_frames[spin_index % COIN_SPIN_FRAMES]
+            glow_index = int(self.animation_time % self.GLOW_PERIOD / self.GLOW_PERIOD * COIN_GLOW_FRAMES)
+            glow_surf = Coin._glow_frames[glow_index % COIN_GLOW_FRAMES]
 
-            glow_surf = pygame.Surface((COIN_SIZE + 20, COIN_SIZE + 20), pygame.SRCALPHA)
-            glow_alpha = int(abs(math.sin(self.animation_time * 2)) * 100 + 50)
-            pygame.draw.circle(glow_surf, (*GOLD[:3], glow_alpha),
-                             (COIN_SIZE//2 + 10, COIN_SIZE//2 + 10), COIN_SIZE//2 + 10)
-
-            screen.blit(glow_surf, (self.x - scaled_width//2 - 10, self.y + bob_y - 10))
-            screen.blit(scaled_image, (self.x - scaled_width//2, self.y + bob_y))
+            screen.blit(glow_surf, (self.x - half_width - 10, self.y + bob_y - 10))
+            screen.blit(scaled_image, (self.x - half_width, self.y + bob_y))
 
     def check_collision(self, barbie):
         if self.collected:
             return False
 
-        distance = math.sqrt((self.x - barbie.x)**2 + (self.y - barbie.y)**2)
-        return distance < COIN_COLLECT_RADIUS
+        # Монета - подбираемый бонус с щедрым радиусом, поэтому без маски: отсечение по x и квадрат расстояния
+        dx = self.x - barbie.x
+        if dx >= COIN_COLLECT_RADIUS or dx <= -COIN_COLLECT_RADIUS:
+            return False
+        dy = self.y - barbie.y
+        return dx * dx + dy * dy < COIN_COLLECT_RADIUS * COIN_COLLECT_RADIUS
 
 
 class CoinManager:
 
     def __init__(self):
-        self.coins = []
+        # Монеты упорядочены по x, собранные и ушедшие за экран возвращаются в пул
+        self.coins = deque()
+        self.pool = []
         self.collected_count = 0
 
     def spawn_coin(self, x, y):
-        coin = Coin(x, y)
-        self.coins.append(coin)
+        if self.pool:
+            coin = self.pool.pop()
+            coin.reset(x, y)
+        else:
+            coin = Coin(x, y)
+
+        if not self.coins or x >= self.coins[-1].x:
+            self.coins.append(coin)
+            return
+        index = 0
+        while self.coins[index].x <= x:
+            index += 1
+        self.coins.insert(index, coin)
 
     def update(self, dt, barbie):
-        for coin in self.coins[:]:
+        # Один проход с вращением очереди: порядок сохраняется, копий списка нет
+        for _ in range(len(self.coins)):
+            coin = self.coins.popleft()
             coin.update(dt)
 
             if coin.check_collision(barbie):
                 coin.collected = True
                 self.collected_count += 1
                 play_sound('score')
-                self.coins.remove(coin)
+                self.pool.append(coin)
 
             elif coin.x < -100:
-                self.coins.remove(coin)
+                self.pool.append(coin)
+
+            else:
+                self.coins.append(coin)
 
     def render(self, screen):
         for coin in self.coins:
             coin.render(screen)
 
     def reset(self):
+        self.pool.extend(self.coins)
         self.coins.clear()
         self.collected_count = 0
@@ -4,6 +4,51 @@ import math
 import random
 from game.constants import *
 from game.sound_generator import play_sound
+from game.assets import get_assets
+from game.stamp_cache import get_stamp_cache
+from game.rotation_cache import get_rotation_cache
+
+
+class SparkleStore:
+
+    # Параллельные массивы фиксированной ёмкости: живые искры всегда лежат в [0, count)
+    __slots__ = ("capacity", "count", "x", "y", "life", "speed", "size", "color")
+
+    def __init__(self, capacity=SPARKLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = [0] * capacity
+        self.y = [0] * capacity
+        self.life = [0.0] * capacity
+        self.speed = [0] * capacity
+        self.size = [0] * capacity
+        self.color = [WHITE] * capacity
+
+    def add(self, x, y, life, speed, size, color):
+        if self.count == self.capacity:
+            return
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.life[i] = life
+        self.speed[i] = speed
+        self.size[i] = size
+        self.color[i] = color
+        self.count += 1
+
+    def remove(self, i):
+        # Удаление перестановкой с последней: порядок искр не важен
+        last = self.count - 1
+        self.x[i] = self.x[last]
+        self.y[i] = self.y[last]
+        self.life[i] = self.life[last]
+        self.speed[i] = self.speed[last]
+        self.size[i] = self.size[last]
+        self.color[i] = self.color[last]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
 
 
 class FlappyBarbie:
@@ -19,26 +64,78 @@ class FlappyBarbie:
         self.rotation = 0
         self.is_alive = True
 
+        self.prev_y = y
+        self.prev_rotation = 0
+        # Куда привёл бы шаг без упора в землю и в какой его доле Барби коснулась земли
+        self.step_end_y = y
+        self.ground_time = None
+
         # СУПЕР МЕГА ПРАЙМ ЭФФЕКТЫ!
-        self.trail = []
+        self.trail_x = [0] * TRAIL_CAPACITY
+        self.trail_y = [0] * TRAIL_CAPACITY
+        self.trail_head = 0
+        self.trail_count = 0
+        self.trail_length = 0
+        self.trail_stamps = []
+        self.set_trail_length(TRAIL_LENGTH)
         self.sparkle_timer = 0
-        self.sparkles = []
+        self.sparkles = SparkleStore()
         self.glow_pulse = 0
 
+        self.skin = "default"
+        self.rotations = None
         try:
-            self.sprite = pygame.image.load("assets/images/barbi.gif").convert_alpha()
-            self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
-            self.has_sprite = True
+            sprite = get_assets().scaled(f"{IMAGES_DIR}/barbi.gif", (self.width, self.height))
+            self.set_skin("default", sprite)
         except:
             self.sprite = None
             self.has_sprite = False
 
+    def set_skin(self, skin_id, sprite):
+        self.skin = skin_id
+        self.sprite = sprite
+        self.has_sprite = True
+        self.rotations = get_rotation_cache(skin_id, sprite)
+
+    def set_trail_length(self, length):
+        # Штампы следа готовятся один раз на длину, а не каждый кадр
+        length = max(0, min(length, TRAIL_CAPACITY))
+        self.trail_length = length
+        self.trail_count = min(self.trail_count, length)
+
+        stamps = get_stamp_cache()
+        self.trail_stamps = []
+        for i in range(length):
+            alpha = int(255 * (i / length))
+            radius = int(self.width * (0.5 + 0.5 * i / length)) // 2
+            self.trail_stamps.append((stamps.circle(radius, HOT_PINK, alpha), radius))
+
+    def collision_mask(self, y=None):
+        # Маска текущего поворота и мировые координаты её левого верхнего угла
+        if y is None:
+            y = self.y
+        if not (self.has_sprite and self.sprite):
+            return None, self.rect.left, int(y - self.height // 2)
+        mask, offset_x, offset_y = self.rotations.get_mask(self.rotation)
+        return mask, int(self.x) + offset_x, int(y) + offset_y
+
+    def hit(self, t):
+        # Откат к моменту удара внутри шага, чтобы Барби не застревала в шкафу
+        self.y = self.prev_y + (self.step_end_y - self.prev_y) * t
+        self.rect.y = int(self.y - self.height // 2)
+        self.is_alive = False
+
     def flap(self):
         if self.is_alive:
             self.velocity_y = FLAP_STRENGTH
             play_sound('flap')
 
     def update(self, dt):
+        self.prev_y = self.y
+        self.prev_rotation = self.rotation
+        self.step_end_y = self.y
+        self.ground_time = None
+
         if not self.is_alive:
             return
 
@@ -50,123 +147,131 @@ class FlappyBarbie:
         self.y += self.velocity_y * dt
 
         # СУПЕР МЕГА ПРАЙМ ЭФФЕКТЫ!
-        self.trail.append((int(self.x), int(self.y), self.rotation))
-        if len(self.trail) > TRAIL_LENGTH:
-            self.trail.pop(0)
+        if self.trail_length:
+            self.trail_x[self.trail_head] = int(self.x)
+            self.trail_y[self.trail_head] = int(self.y)
+            self.trail_head = (self.trail_head + 1) % TRAIL_CAPACITY
+            if self.trail_count < self.trail_length:
+                self.trail_count += 1
 
         self.sparkle_timer += dt
-        if self.sparkle_timer >= SPARKLE_INTERVAL:
-            self.sparkle_timer = 0
+        while self.sparkle_timer >= SPARKLE_INTERVAL:
+            self.sparkle_timer -= SPARKLE_INTERVAL
             self._create_sparkle()
 
-        for sparkle in self.sparkles[:]:
-            sparkle['life'] -= dt
-            sparkle['y'] -= sparkle['speed'] * dt
-            if sparkle['life'] <= 0:
-                self.sparkles.remove(sparkle)
+        sparkles = self.sparkles
+        i = 0
+        while i < sparkles.count:
+            sparkles.life[i] -= dt
+            if sparkles.life[i] <= 0:
+                sparkles.remove(i)
+                continue
+            sparkles.y[i] -= sparkles.speed[i] * dt
+            i += 1
 
         self.glow_pulse += dt * 5
         if self.glow_pulse > 2 * math.pi:
             self.glow_pulse = 0
 
         self.rotation = -self.velocity_y / 10
-        if self.rotation > 25:
-            self.rotation = 25
-        if self.rotation < -90:
-            self.rotation = -90
+        if self.rotation > BARBIE_MAX_ROTATION:
+            self.rotation = BARBIE_MAX_ROTATION
+        if self.rotation < BARBIE_MIN_ROTATION:
+            self.rotation = BARBIE_MIN_ROTATION
 
         self.rect.x = int(self.x - self.width // 2)
         self.rect.y = int(self.y - self.height // 2)
 
-        if self.y > SCREEN_HEIGHT - GROUND_HEIGHT:
-            self.y = SCREEN_HEIGHT - GROUND_HEIGHT
-            self.is_alive = False
         if self.y < 0:
             self.y = 0
             self.velocity_y = 0
+        # Земля - такой же кандидат на удар, как трубы: PipeManager сравнит её время со своими
+        self.step_end_y = self.y
+        ground = SCREEN_HEIGHT - GROUND_HEIGHT
+        if self.y > ground:
+            self.ground_time = (ground - self.prev_y) / (self.y - self.prev_y)
+            self.y = ground
+            self.rect.y = int(self.y - self.height // 2)
+            self.is_alive = False
 
     def reset(self):
         self.y = BARBIE_START_Y
         self.velocity_y = 0
         self.rotation = 0
+        self.prev_y = self.y
+        self.prev_rotation = 0
+        self.step_end_y = self.y
+        self.ground_time = None
         self.is_alive = True
-        self.trail = []
-        self.sparkles = []
+        self.trail_head = 0
+        self.trail_count = 0
+        self.sparkles.clear()
         self.sparkle_timer = 0
         self.glow_pulse = 0
 
     def _create_sparkle(self):
-        sparkle = {
-            'x': self.x + random.randint(-10, 10),
-            'y': self.y + random.randint(-10, 10),
-            'life': random.uniform(0.3, 0.6),
-            'speed': random.randint(20, 50),
-            'size': random.randint(2, 5),
-            'color': random.choice([GOLD, LIGHT_PINK, WHITE, HOT_PINK])
-        }
-        self.sparkles.append(sparkle)
-
-    def render(self, screen):
+        self.sparkles.add(
+            self.x + random.randint(-10, 10),
+            self.y + random.randint(-10, 10),
+            random.uniform(0.3, 0.6),
+            random.randint(20, 50),
+            random.randint(2, 5),
+            random.choice([GOLD, LIGHT_PINK, WHITE, HOT_PINK])
+        )
+
+    def render(self, screen, alpha=1.0):
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        rotation = self.prev_rotation + (self.rotation - self.prev_rotation) * alpha
+
         # СУПЕР МЕГА ПРАЙМ ЭФФЕКТЫ!
         self._render_trail(screen)
 
-        self._render_glow(screen)
+        self._render_glow(screen, y)
 
         if self.has_sprite and self.sprite:
-            rotated_sprite = pygame.transform.rotate(self.sprite, self.rotation)
-            rotated_rect = rotated_sprite.get_rect(center=(int(self.x), int(self.y)))
-            screen.blit(rotated_sprite, rotated_rect.topleft)
+            rotated_sprite, offset_x, offset_y = self.rotations.get(rotation)
+            screen.blit(rotated_sprite, (int(self.x) + offset_x, int(y) + offset_y))
         else:
-            pygame.draw.circle(screen, HOT_PINK, (int(self.x), int(self.y)), self.width // 2)
+            pygame.draw.circle(screen, HOT_PINK, (int(self.x), int(y)), self.width // 2)
             eye_offset_x = 8
             eye_offset_y = -5
             pygame.draw.circle(screen, BLACK,
-                             (int(self.x - eye_offset_x), int(self.y + eye_offset_y)), 3)
+                             (int(self.x - eye_offset_x), int(y + eye_offset_y)), 3)
             pygame.draw.circle(screen, BLACK,
-                             (int(self.x + eye_offset_x), int(self.y + eye_offset_y)), 3)
+                             (int(self.x + eye_offset_x), int(y + eye_offset_y)), 3)
 
         self._render_sparkles(screen)
 
     def _render_trail(self, screen):
-        for i, (tx, ty, rot) in enumerate(self.trail):
-            alpha = int(255 * (i / len(self.trail))) if self.trail else 0
-            size = int(self.width * (0.5 + 0.5 * i / len(self.trail))) if self.trail else 0
-            color = (*HOT_PINK, alpha)
-            trail_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surf, color, (size//2, size//2), size//2)
-            screen.blit(trail_surf, (tx - size//2, ty - size//2))
-
-    def _render_glow(self, screen):
+        count = self.trail_count
+        length = self.trail_length
+        start = self.trail_head - count
+        for i in range(count):
+            index = (start + i) % TRAIL_CAPACITY
+            trail_surf, radius = self.trail_stamps[i if count == length else i * length // count]
+            screen.blit(trail_surf, (self.trail_x[index] - radius, self.trail_y[index] - radius))
+
+    def _render_glow(self, screen, y):
         pulse = abs(math.sin(self.glow_pulse))
         glow_size = int(self.width * (1.5 + 0.5 * pulse))
         alpha = int(100 * pulse)
 
         glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
         pygame.draw.circle(glow_surf, (*GOLD, alpha), (glow_size//2, glow_size//2), glow_size//2)
-        screen.blit(glow_surf, (int(self.x - glow_size//2), int(self.y - glow_size//2)))
+        screen.blit(glow_surf, (int(self.x - glow_size//2), int(y - glow_size//2)))
 
         inner_size = glow_size // 2
         inner_surf = pygame.Surface((inner_size, inner_size), pygame.SRCALPHA)
         pygame.draw.circle(inner_surf, (*HOT_PINK, alpha * 2), (inner_size//2, inner_size//2), inner_size//2)
-        screen.blit(inner_surf, (int(self.x - inner_size//2), int(self.y - inner_size//2)))
+        screen.blit(inner_surf, (int(self.x - inner_size//2), int(y - inner_size//2)))
 
     def _render_sparkles(self, screen):
-        for sparkle in self.sparkles:
-            alpha = int(255 * (sparkle['life'] / 0.6))
-            size = sparkle['size']
-            color = (*sparkle['color'][:3], alpha)
-
-            x, y = int(sparkle['x']), int(sparkle['y'])
-            points = []
-            for i in range(8):
-                angle = i * 45 * math.pi / 180
-                r = size if i % 2 == 0 else size // 2
-                px = x + int(r * math.cos(angle))
-                py = y + int(r * math.sin(angle))
-                points.append((px, py))
-
-            sparkle_surf = pygame.Surface((size*3, size*3), pygame.SRCALPHA)
-            offset_points = [(p[0] - x + size*1.5, p[1] - y + size*1.5) for p in points]
-            if len(offset_points) >= 3:
-                pygame.draw.polygon(sparkle_surf, color, offset_points)
+        stamps = get_stamp_cache()
+        sparkles = self.sparkles
+        for i in range(sparkles.count):
+            alpha = int(255 * (sparkles.life[i] / 0.6))
+            size = sparkles.size[i]
+
+            x, y = int(sparkles.x[i]), int(sparkles.y[i])
+            sparkle_surf = stamps.star(size, sparkles.color[i], alpha, 4)
             screen.blit(sparkle_surf, (x - size*1.5, y - size*1.5))
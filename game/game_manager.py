@@ -7,16 +7,21 @@ from game.constants import *
 from game.states.menu_state import MenuState
 from game.states.playing_state import PlayingState
 from game.states.game_over_state import GameOverState
+from game.profiler import FrameProfiler
 
 
 class GameManager:
 
-    def __init__(self, screen):
+    def __init__(self, screen, headless=False, profiler=None):
         self.screen = screen
+        self.headless = headless
+        self.profiler = profiler if profiler is not None else FrameProfiler()
         self.current_state = None
         self.states = {}
         self.score = 0
         self.game_start_time = 0
+        self.interpolation = 1.0
+        self.particle_count = PARTICLE_COUNT
 
         self.states[GAME_STATE_MENU] = MenuState(self)
         self.states[GAME_STATE_PLAYING] = PlayingState(self)
@@ -65,7 +70,7 @@ class GameManager:
             self.game_start_time = time.time()
             self.score = 0
 
-        if state_name == GAME_STATE_GAME_OVER:
+        if state_name == GAME_STATE_GAME_OVER and not self.headless:
             self.update_stats_on_death()
 
         self.current_state = self.states.get(state_name)
@@ -73,6 +78,12 @@ class GameManager:
         if self.current_state:
             self.current_state.enter()
 
+    def set_particle_count(self, count):
+        self.particle_count = count
+        playing = self.states.get(GAME_STATE_PLAYING)
+        if playing and playing.particle_system:
+            playing.particle_system.set_count(count)
+
     def handle_event(self, event):
         if self.current_state:
             self.current_state.handle_event(event)
@@ -81,6 +92,8 @@ class GameManager:
         if self.current_state:
             self.current_state.update(dt)
 
-    def render(self):
+    def render(self, alpha=1.0):
+        self.interpolation = alpha
         if self.current_state:
             self.current_state.render(self.screen)
+        self.profiler.mark("render")
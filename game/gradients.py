@@ -0,0 +1,66 @@
+
+import pygame
+import numpy as np
+from collections import OrderedDict
+from game.constants import *
+from game.assets import surface_bytes
+
+
+class GradientCache:
+
+    def __init__(self, max_entries=GRADIENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.gradients = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def vertical(self, top, bottom, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        key = (tuple(top), tuple(bottom), size)
+        surface = self.gradients.get(key)
+        if surface is not None:
+            self.gradients.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._build(top, bottom, size)
+        self.gradients[key] = surface
+        while len(self.gradients) > self.max_entries:
+            self.gradients.popitem(last=False)
+        return surface
+
+    def location(self, location_id, size=(SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT)):
+        location_data = LOCATIONS.get(location_id, LOCATIONS["default"])
+        top, bottom = location_data["colors"]
+        return self.vertical(top, bottom, size)
+
+    def _build(self, top, bottom, size):
+        width, height = size
+        # Та же формула, что и у построчной отрисовки: цвет y-й строки = top + (bottom - top) * y / height
+        ratio = np.arange(height, dtype=np.float64)[:, None] / height
+        top = np.array(top, dtype=np.float64)
+        bottom = np.array(bottom, dtype=np.float64)
+        column = (top + (bottom - top) * ratio).astype(np.uint8)
+
+        surface = pygame.surfarray.make_surface(np.broadcast_to(column, (width, height, 3)))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def stats(self):
+        return {
+            "entries": len(self.gradients),
+            "memory": sum(surface_bytes(surface) for surface in self.gradients.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_gradient_cache = None
+
+
+def get_gradient_cache():
+    global _gradient_cache
+    if _gradient_cache is None:
+        _gradient_cache = GradientCache()
+    return _gradient_cache
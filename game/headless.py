@@ -0,0 +1,110 @@
+
+import os
+import sys
+import time
+import random
+import argparse
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.constants import *
+from game.game_manager import GameManager
+
+
+def init_headless():
+    pygame.display.init()
+    pygame.font.init()
+
+
+class HeadlessRunner:
+
+    def __init__(self, render=True, autopilot=True, seed=None, tick_rate=TICK_RATE):
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
+        init_headless()
+        self.render = render
+        self.autopilot = autopilot
+        self.step = 1.0 / tick_rate
+
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.game_manager = GameManager(self.surface, headless=True)
+        self.playing_state = self.game_manager.states[GAME_STATE_PLAYING]
+
+        self.frames = 0
+        self.runs = 0
+        self.scores = []
+        self._start_run()
+
+    def _start_run(self):
+        self.game_manager.change_state(GAME_STATE_PLAYING)
+        self.runs += 1
+        if self.autopilot:
+            self._flap()
+
+    def _flap(self):
+        self.playing_state.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+
+    def _autopilot_step(self):
+        barbie = self.playing_state.barbie
+        target_y = (SCREEN_HEIGHT - GROUND_HEIGHT) // 2
+        for pipe in self.playing_state.pipe_manager.pipes:
+            if pipe.x + pipe.width >= barbie.x - barbie.width // 2:
+                target_y = pipe.gap_y + 40
+                break
+
+        if barbie.y > target_y and barbie.velocity_y > 0:
+            self._flap()
+
+    def step_frame(self):
+        if self.game_manager.current_state is not self.playing_state:
+            self.scores.append(self.game_manager.score)
+            self._start_run()
+
+        if self.autopilot:
+            self._autopilot_step()
+
+        self.game_manager.update(self.step)
+        if self.render:
+            self.game_manager.render()
+        self.frames += 1
+
+    def run(self, frames):
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step_frame()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "frames": frames,
+            "runs": self.runs,
+            "best_score": max(self.scores + [self.playing_state.pipe_manager.score]),
+            "elapsed": elapsed,
+            "fps": frames / elapsed if elapsed > 0 else 0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Безоконный прогон игрового процесса")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--no-render", action="store_true", help="не рисовать кадры вообще")
+    parser.add_argument("--no-autopilot", action="store_true", help="не управлять Барби")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="тиков симуляции в секунду")
+    args = parser.parse_args(argv)
+
+    runner = HeadlessRunner(render=not args.no_render, autopilot=not args.no_autopilot, seed=args.seed,
+                            tick_rate=args.tick_rate)
+    result = runner.run(args.frames)
+    print(f"🤖 Кадров: {result['frames']}, забегов: {result['runs']}, рекорд: {result['best_score']}")
+    print(f"⏱️ {result['elapsed']:.2f} с, {result['fps']:.0f} кадров/с")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+
+import queue
+import random
+import threading
+import pygame
+import numpy as np
+from game.constants import *
+from game.sound_generator import encode_pcm
+
+
+# Ступени пентатоники в полутонах от тоники и аккорды по тактам (I - vi - IV - V)
+PENTATONIC = [0, 2, 4, 7, 9, 12, 14, 16]
+PROGRESSION = [0, -3, -7, -5]
+
+
+class ProceduralTrack:
+    # Бесконечный трек: мелодия восьмыми по пентатонике поверх баса, который меняется раз в такт.
+    # Любой отрезок считается по абсолютному номеру сэмпла, поэтому куски стыкуются без щелчков
+
+    def __init__(self, sample_rate, seed=MUSIC_SEED):
+        self.sample_rate = sample_rate
+        self.step_samples = int(sample_rate * 60 / MUSIC_BPM / 2)
+        self.bar_samples = self.step_samples * MUSIC_STEPS_PER_BAR
+
+        rng = random.Random(seed)
+        steps = MUSIC_STEPS_PER_BAR * len(PROGRESSION) * MUSIC_PATTERN_BARS
+        self.melody = np.zeros(steps)
+        for step in range(steps):
+            if rng.random() < MUSIC_REST_CHANCE:
+                continue
+            root = PROGRESSION[(step // MUSIC_STEPS_PER_BAR) % len(PROGRESSION)]
+            self.melody[step] = self._frequency(root + rng.choice(PENTATONIC))
+        self.bass = np.array([self._frequency(root - 12) for root in PROGRESSION])
+
+    @staticmethod
+    def _frequency(semitones):
+        return MUSIC_ROOT_FREQUENCY * 2 ** (semitones / 12)
+
+    def render(self, start, count):
+        position = np.arange(start, start + count, dtype=np.int64)
+        step = position // self.step_samples
+        bar = position // self.bar_samples
+        # Время от начала ноты, а не от начала трека: точность не падает, сколько бы трек ни играл
+        note_time = (position - step * self.step_samples) / self.sample_rate
+        bar_time = (position - bar * self.bar_samples) / self.sample_rate
+
+        melody = self.melody[step % len(self.melody)]
+        attack = np.minimum(note_time / 0.005, 1.0)
+        wave = np.sin(2.0 * np.pi * melody * note_time) * np.exp(-6 * note_time) * attack * 0.45
+
+        bass = self.bass[bar % len(self.bass)]
+        attack = np.minimum(bar_time / 0.01, 1.0)
+        wave += np.sin(2.0 * np.pi * bass * bar_time) * np.exp(-1.5 * bar_time) * attack * 0.35
+        return wave
+
+
+class MusicEngine:
+
+    def __init__(self, volume=MUSIC_VOLUME):
+        self.volume = volume
+        self.enabled = MUSIC_ENABLED
+        self.channel = None
+        self.track = None
+        self.chunks = queue.Queue(maxsize=MUSIC_QUEUE_CHUNKS)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.position = 0
+        self.playing = False
+        self.chunks_played = 0
+        self.underruns = 0
+
+    def start(self):
+        if self.thread is not None:
+            return
+        mixer_info = pygame.mixer.get_init()
+        if mixer_info is None:
+            print("🔇 Микшер не инициализирован, музыка отключена")
+            return
+
+        # Зарезервированный канал не достанется звукам, которые сами ищут свободный канал
+        pygame.mixer.set_reserved(SOUND_RESERVED_CHANNELS)
+        self.channel = pygame.mixer.Channel(MUSIC_CHANNEL)
+        self.track = ProceduralTrack(mixer_info[0])
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, args=(mixer_info,), name="music", daemon=True)
+        self.thread.start()
+        print(f"🎶 Музыка: {MUSIC_BPM} BPM, куски по {MUSIC_CHUNK_SECONDS * 1000:.0f} мс")
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.thread = None
+        self.playing = False
+        self.channel.stop()
+        while not self.chunks.empty():
+            self.chunks.get_nowait()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled and self.channel is not None:
+            # Остановленный вручную канал при включении обратно не считается опустошением
+            self.playing = False
+            self.channel.stop()
+
+    def _run(self, mixer_info):
+        sample_rate, format_bits, num_channels = mixer_info
+        count = int(sample_rate * MUSIC_CHUNK_SECONDS)
+        while not self.stop_event.is_set():
+            pcm = encode_pcm(self.track.render(self.position, count), format_bits, num_channels)
+            sound = pygame.mixer.Sound(buffer=pcm)
+            self.position += count
+            # Очередь ограничена: поток засыпает, пока игра не заберёт кусок
+            while not self.stop_event.is_set():
+                try:
+                    self.chunks.put(sound, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def update(self):
+        # Вызывается каждый кадр: подкладывает в канал следующий кусок, пока играет текущий
+        if not self.enabled or self.channel is None:
+            return
+
+        # Между кусками канал на миг свободен, но очередь ещё не забрана: это не опустошение
+        if not self.channel.get_busy() and self.channel.get_queue() is None:
+            if self.playing:
+                self.underruns += 1
+            if not self._play_next():
+                return
+        if self.channel.get_queue() is None:
+            self._play_next(queued=True)
+
+    def _play_next(self, queued=False):
+        try:
+            sound = self.chunks.get_nowait()
+        except queue.Empty:
+            return False
+
+        if queued:
+            self.channel.queue(sound)
+        else:
+            self.channel.play(sound)
+            self.channel.set_volume(self.volume)
+            self.playing = True
+        self.chunks_played += 1
+        return True
+
+
+_music_engine = None
+
+
+def get_music_engine():
+    global _music_engine
+    if _music_engine is None:
+        _music_engine = MusicEngine()
+    return _music_engine
@@ -0,0 +1,126 @@
+
+import pygame
+import time
+from game.constants import *
+
+
+class Presenter:
+
+    def __init__(self, game_size, mode=PRESENT_MODE, fullscreen=FULLSCREEN):
+        self.game_size = game_size
+        self.mode = mode if mode in PRESENT_MODES else PRESENT_SMOOTH
+        self.fullscreen = fullscreen
+        self.screen = None
+
+        self.dest = (0, 0)
+        self.scaled_size = game_size
+        self.scaled_surface = None
+        self.needs_scaling = False
+
+        self.last_cost = 0
+        self.average_cost = 0
+        self.frames = 0
+
+        self.create_display()
+
+    def create_display(self):
+        if self.mode == PRESENT_SCALED:
+            flags = pygame.SCALED
+            if self.fullscreen:
+                flags |= pygame.FULLSCREEN
+            elif RESIZABLE:
+                flags |= pygame.RESIZABLE
+            try:
+                self.screen = pygame.display.set_mode(self.game_size, flags)
+            except pygame.error as e:
+                print(f"⚠️ Режим SCALED недоступен: {e}")
+                self.mode = PRESENT_SMOOTH
+                self.create_display()
+                return
+        elif self.fullscreen:
+            desktop_w, desktop_h = pygame.display.get_desktop_sizes()[0]
+            self.screen = pygame.display.set_mode((desktop_w, desktop_h), pygame.FULLSCREEN | pygame.NOFRAME)
+        else:
+            flags = pygame.RESIZABLE if RESIZABLE else 0
+            self.screen = pygame.display.set_mode(self.game_size, flags)
+
+        self._update_geometry()
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        self.create_display()
+        return self.fullscreen
+
+    def set_mode(self, mode):
+        if mode not in PRESENT_MODES or mode == self.mode:
+            return
+        rebuild = PRESENT_SCALED in (mode, self.mode)
+        self.mode = mode
+        self.average_cost = 0
+        self.frames = 0
+        if rebuild:
+            self.create_display()
+        else:
+            self._update_geometry()
+
+    def cycle_mode(self):
+        previous = self.report()
+        index = PRESENT_MODES.index(self.mode)
+        self.set_mode(PRESENT_MODES[(index + 1) % len(PRESENT_MODES)])
+        return previous
+
+    def handle_resize(self):
+        if self.mode != PRESENT_SCALED:
+            self.screen = pygame.display.get_surface()
+        self._update_geometry()
+
+    def _update_geometry(self):
+        screen_w, screen_h = self.screen.get_size()
+        game_w, game_h = self.game_size
+
+        if (screen_w, screen_h) == (game_w, game_h) or self.mode in (PRESENT_DIRECT, PRESENT_SCALED):
+            scaled_w, scaled_h = game_w, game_h
+        elif self.mode == PRESENT_INTEGER:
+            factor = min(screen_w // game_w, screen_h // game_h)
+            if factor >= 1:
+                scaled_w, scaled_h = game_w * factor, game_h * factor
+            else:
+                divisor = max(-(-game_w // screen_w), -(-game_h // screen_h))
+                scaled_w, scaled_h = game_w // divisor, game_h // divisor
+        else:
+            scale = min(screen_w / game_w, screen_h / game_h)
+            scaled_w, scaled_h = int(game_w * scale), int(game_h * scale)
+
+        self.scaled_size = (scaled_w, scaled_h)
+        self.needs_scaling = self.scaled_size != self.game_size
+        self.dest = ((screen_w - scaled_w) // 2, (screen_h - scaled_h) // 2)
+        if not self.needs_scaling or (self.scaled_surface and self.scaled_surface.get_size() != self.scaled_size):
+            self.scaled_surface = None
+
+        self.screen.fill(BLACK)
+
+    def present(self, game_surface):
+        start = time.perf_counter()
+
+        if not self.needs_scaling:
+            self.screen.blit(game_surface, self.dest)
+        else:
+            if self.scaled_surface is None:
+                self.scaled_surface = pygame.Surface(self.scaled_size, 0, game_surface)
+            if self.mode == PRESENT_INTEGER:
+                pygame.transform.scale(game_surface, self.scaled_size, self.scaled_surface)
+            else:
+                pygame.transform.smoothscale(game_surface, self.scaled_size, self.scaled_surface)
+            self.screen.blit(self.scaled_surface, self.dest)
+
+        self.last_cost = time.perf_counter() - start
+        self.frames += 1
+        if self.frames == 1:
+            self.average_cost = self.last_cost
+        else:
+            self.average_cost += (self.last_cost - self.average_cost) * 0.05
+
+    def report(self):
+        screen_w, screen_h = self.screen.get_size()
+        return (f"{self.mode} {screen_w}x{screen_h} -> {self.scaled_size[0]}x{self.scaled_size[1]}: "
+                f"{self.average_cost * 1000:.2f} ms/кадр")
@@ -0,0 +1,187 @@
+
+import pygame
+import time
+from collections import deque
+from game.constants import *
+from game.stamp_cache import get_stamp_cache
+from game.assets import get_assets
+from game.text_cache import get_text_cache
+from game.sound_generator import get_sound_generator
+
+
+STAGE_COLORS = [
+    (255, 99, 132), (54, 162, 235), (255, 206, 86), (75, 192, 192),
+    (153, 102, 255), (255, 159, 64), (46, 204, 113), (231, 76, 60),
+    (241, 196, 15), (26, 188, 156), (155, 89, 182), (52, 152, 219),
+    (230, 126, 34), (149, 165, 166), (236, 240, 241), (255, 20, 147),
+]
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+
+    def __init__(self):
+        self.visible = False
+        self.frame_times = deque(maxlen=PROFILER_HISTORY)
+        self.stage_times = {}
+        self.stage_colors = {}
+        self.current = {}
+        self.frame_start = 0
+        self.last_mark = 0
+        self.frame_count = 0
+
+        self.font = None
+        self.graph = None
+        self.panel = None
+        self.text_surfaces = []
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frame_times.clear()
+        self.stage_times.clear()
+        self.current = {}
+        self.frame_start = 0
+        self.frame_count = 0
+        self.graph = None
+        self.text_surfaces = []
+        return self.visible
+
+    def begin_frame(self):
+        if not self.visible:
+            return
+
+        now = time.perf_counter()
+        if self.frame_start:
+            self._record_frame(now - self.frame_start)
+        self.frame_start = now
+        self.last_mark = now
+        self.current = {}
+
+    def mark(self, stage):
+        if not self.visible:
+            return
+
+        now = time.perf_counter()
+        self.current[stage] = self.current.get(stage, 0) + now - self.last_mark
+        self.last_mark = now
+
+    def _record_frame(self, frame_time):
+        self.frame_times.append(frame_time)
+        self.frame_count += 1
+
+        for stage in list(self.stage_times):
+            self.stage_times[stage] *= 0.9
+            if stage not in self.current and self.stage_times[stage] < 0.00001:
+                del self.stage_times[stage]
+        for stage, stage_time in self.current.items():
+            if stage not in self.stage_colors:
+                self.stage_colors[stage] = STAGE_COLORS[len(self.stage_colors) % len(STAGE_COLORS)]
+            self.stage_times[stage] = self.stage_times.get(stage, 0) + stage_time * 0.1
+
+        self._draw_column(frame_time)
+
+        if self.frame_count % PROFILER_TEXT_INTERVAL == 1:
+            self._update_text()
+
+    def _draw_column(self, frame_time):
+        width = PROFILER_HISTORY * PROFILER_COLUMN_WIDTH
+        height = PROFILER_GRAPH_HEIGHT
+        if self.graph is None:
+            self.graph = pygame.Surface((width, height))
+            self.graph.fill((20, 10, 30))
+
+        self.graph.scroll(-PROFILER_COLUMN_WIDTH, 0)
+        x = width - PROFILER_COLUMN_WIDTH
+        self.graph.fill((20, 10, 30), (x, 0, PROFILER_COLUMN_WIDTH, height))
+
+        bottom = height
+        for stage, stage_time in self.current.items():
+            bar = int(stage_time * 1000 / PROFILER_MS_PER_PIXEL)
+            if bar <= 0:
+                continue
+            top = max(0, bottom - bar)
+            self.graph.fill(self.stage_colors[stage], (x, top, PROFILER_COLUMN_WIDTH, bottom - top))
+            bottom = top
+            if bottom == 0:
+                break
+
+        budget_y = height - int(1000 / RENDER_FPS / PROFILER_MS_PER_PIXEL)
+        if budget_y >= 0:
+            self.graph.fill(GREEN, (x, budget_y, PROFILER_COLUMN_WIDTH, 1))
+        frame_y = max(0, height - 1 - int(frame_time * 1000 / PROFILER_MS_PER_PIXEL))
+        self.graph.fill(WHITE, (x, frame_y, PROFILER_COLUMN_WIDTH, 1))
+
+    def _update_text(self):
+        if self.font is None:
+            self.font = get_text_cache().font(28)
+
+        ordered = sorted(self.frame_times)
+        mean = sum(ordered) / len(ordered) if ordered else 0
+        fps = int(1 / mean) if mean > 0 else 0
+        summary = (f"FPS {fps}  кадр {mean * 1000:.1f} мс  p50 {percentile(ordered, 50) * 1000:.1f}  "
+                   f"p95 {percentile(ordered, 95) * 1000:.1f}  p99 {percentile(ordered, 99) * 1000:.1f}")
+        color = WHITE if percentile(ordered, 95) <= 1.0 / RENDER_FPS * 1.1 else RED
+        self.text_surfaces = [(self.font.render(summary, True, color), None)]
+
+        stamps = get_stamp_cache().stats()
+        stamp_line = (f"штампы {stamps['entries']} ({stamps['memory'] // 1024} КБ)  "
+                      f"попадания {stamps['hits']}  промахи {stamps['misses']}  вытеснения {stamps['evictions']}")
+        self.text_surfaces.append((self.font.render(stamp_line, True, WHITE), None))
+
+        text = get_text_cache().stats()
+        text_line = (f"текст {text['entries']} ({text['fonts']} шрифтов)  "
+                     f"попадания {text['hits']}  промахи {text['misses']}")
+        self.text_surfaces.append((self.font.render(text_line, True, WHITE), None))
+
+        assets = get_assets().stats()
+        asset_line = (f"изображения {assets['images']} + копий {assets['scaled']} ({assets['memory'] // 1024} КБ)  "
+                      f"загрузка {assets['load_time'] * 1000:.0f} мс")
+        self.text_surfaces.append((self.font.render(asset_line, True, WHITE), None))
+
+        sound = get_sound_generator().stats()
+        sound_line = (f"звуки {sound['played']}  склеено {sound['coalesced']}  "
+                      f"вытеснено {sound['stolen']}  потеряно {sound['dropped']}")
+        self.text_surfaces.append((self.font.render(sound_line, True, WHITE), None))
+
+        for stage, stage_time in self.stage_times.items():
+            label = self.font.render(f"{stage} {stage_time * 1000:.2f}", True, WHITE)
+            self.text_surfaces.append((label, self.stage_colors[stage]))
+
+    def render(self, screen):
+        if not self.visible or self.graph is None:
+            return
+
+        columns = 2
+        line_height = 24
+        graph_w, graph_h = self.graph.get_size()
+        header = [label for label, color in self.text_surfaces if color is None]
+        legend = [(label, color) for label, color in self.text_surfaces if color is not None]
+        legend_rows = (len(legend) + columns - 1) // columns
+        panel_w = max([graph_w] + [label.get_width() for label in header]) + 20
+        panel_h = graph_h + 26 + (len(header) + legend_rows) * line_height
+        if self.panel is None or self.panel.get_size() != (panel_w, panel_h):
+            self.panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+
+        x = 20
+        y = SCREEN_HEIGHT - 20 - panel_h
+        screen.blit(self.panel, (x, y))
+        screen.blit(self.graph, (x + 10, y + 10))
+
+        text_y = y + graph_h + 18
+        for label in header:
+            screen.blit(label, (x + 10, text_y))
+            text_y += line_height
+
+        column_w = graph_w // columns
+        for i, (label, color) in enumerate(legend):
+            lx = x + 10 + (i % columns) * column_w
+            ly = text_y + (i // columns) * line_height
+            screen.fill(color, (lx, ly + 3, 12, 12))
+            screen.blit(label, (lx + 18, ly))
@@ -0,0 +1,65 @@
+
+import pygame
+from game.constants import *
+
+
+class RotationCache:
+
+    def __init__(self, sprite, step=BARBIE_ROTATION_STEP,
+                 min_angle=BARBIE_MIN_ROTATION, max_angle=BARBIE_MAX_ROTATION):
+        self.sprite = sprite
+        self.step = step
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        count = int((max_angle - min_angle) / step + 0.5) + 1
+        self.variants = [None] * count
+        self.masks = [None] * count
+
+    def index(self, angle):
+        if angle <= self.min_angle:
+            return 0
+        if angle >= self.max_angle:
+            return len(self.variants) - 1
+        return int((angle - self.min_angle) / self.step + 0.5)
+
+    def get(self, angle):
+        index = self.index(angle)
+        variant = self.variants[index]
+        if variant is None:
+            variant = self._build(index)
+        return variant
+
+    def get_mask(self, angle):
+        # Маска с теми же смещениями, что и у картинки: коллизия совпадает с тем, что видно на экране
+        index = self.index(angle)
+        mask = self.masks[index]
+        if mask is None:
+            self._build(index)
+            mask = self.masks[index]
+        return mask
+
+    def _build(self, index):
+        angle = min(self.min_angle + index * self.step, self.max_angle)
+        rotated = pygame.transform.rotate(self.sprite, angle)
+        width, height = rotated.get_size()
+        variant = (rotated, -(width // 2), -(height // 2))
+        self.variants[index] = variant
+        self.masks[index] = (pygame.mask.from_surface(rotated), -(width // 2), -(height // 2))
+        return variant
+
+    def build_all(self):
+        for index in range(len(self.variants)):
+            if self.variants[index] is None:
+                self._build(index)
+        return self
+
+
+_rotation_caches = {}
+
+
+def get_rotation_cache(skin_id, sprite):
+    cache = _rotation_caches.get(skin_id)
+    if cache is None or cache.sprite is not sprite:
+        cache = RotationCache(sprite).build_all()
+        _rotation_caches[skin_id] = cache
+    return cache
@@ -1,16 +1,79 @@
 
+import os
+import time
+import hashlib
 import pygame
-import struct
-import math
+import numpy as np
+from collections import Counter
+from game.constants import *
+
+
+# Меняется вместе с формулой синтеза, чтобы старый кэш на диске не подхватился
+SYNTH_VERSION = 1
+
+# Формат микшера -> (dtype, множитель, смещение нуля)
+SAMPLE_FORMATS = {
+    -16: ("i2", 16384, 0),
+    16: ("u2", 16384, 32768),
+    -8: ("i1", 64, 0),
+    8: ("u1", 64, 128),
+    -32: ("f4", 0.5, 0),
+}
+
+
+def synthesize_beep(frequency, duration, volume, sample_rate):
+    # Затухающий синус с плавным началом, значения в -1..1
+    t = np.arange(int(sample_rate * duration), dtype=np.float64) / sample_rate
+    decay = np.exp(-5 * t / duration)
+    fade_in = np.minimum(t / 0.01, 1.0)
+    return np.sin(2.0 * np.pi * frequency * t) * decay * fade_in * volume
+
+
+def encode_pcm(wave, format_bits, num_channels):
+    if format_bits not in SAMPLE_FORMATS:
+        raise ValueError(f"неподдерживаемый формат микшера: {format_bits}")
+    dtype, scale, zero = SAMPLE_FORMATS[format_bits]
+    samples = wave * scale
+    if zero:
+        samples += zero
+    samples = samples.astype(dtype)
+    # Кадр = одинаковый сэмпл во всех каналах, как ждёт микшер (interleaved)
+    return np.ascontiguousarray(np.broadcast_to(samples[:, None], (len(samples), num_channels)))
+
+
+class ChannelSlot:
+    __slots__ = ("channel", "priority", "started")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.priority = 0
+        self.started = 0.0
 
 
 class SoundGenerator:
 
-    def __init__(self):
+    def __init__(self, cache_dir=SOUND_CACHE_DIR):
         self.sounds = {}
         self.sound_enabled = True
+        self.muted = False
+        self.cache_dir = cache_dir
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.channel_groups = {}
+        self.last_played = {}
+        self.played = Counter()
+        self.coalesced = Counter()
+        self.stolen = Counter()
+        self.dropped = Counter()
+
+        if pygame.mixer.get_init() is None:
+            print("🔇 Микшер не инициализирован, звук отключён")
+            self.sound_enabled = False
+            return
 
         try:
+            self._setup_channels()
             self.generate_all_sounds()
         except Exception as e:
             print(f"⚠️ Не удалось создать звуки: {e}")
@@ -18,6 +81,38 @@ class SoundGenerator:
             traceback.print_exc()
             self.sound_enabled = False
 
+    def _setup_channels(self):
+        if pygame.mixer.get_num_channels() < SOUND_RESERVED_CHANNELS:
+            pygame.mixer.set_num_channels(SOUND_RESERVED_CHANNELS)
+        pygame.mixer.set_reserved(SOUND_RESERVED_CHANNELS)
+
+        index = MUSIC_CHANNEL + 1
+        for category, count in SOUND_CHANNEL_GROUPS.items():
+            self.channel_groups[category] = [ChannelSlot(pygame.mixer.Channel(index + i)) for i in range(count)]
+            index += count
+
+    def _cache_path(self, params, mixer_info):
+        key = hashlib.sha1(repr((SYNTH_VERSION, params, mixer_info)).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"beep-{key}.pcm")
+
+    def _load_cached(self, path, dtype, num_bytes):
+        try:
+            if os.path.getsize(path) != num_bytes:
+                return None
+        except OSError:
+            return None
+        # Файл отображается в память, микшер копирует сэмплы прямо из него
+        return pygame.mixer.Sound(buffer=np.memmap(path, dtype=dtype, mode='r'))
+
+    def _save_cached(self, path, pcm):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            pcm.tofile(temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить звук в кэш: {e}")
+
     def create_beep(self, frequency, duration, volume=1.0):
         try:
             mixer_info = pygame.mixer.get_init()
@@ -25,37 +120,23 @@ class SoundGenerator:
                 return None
 
             sample_rate, format_bits, num_channels = mixer_info
+            dtype = SAMPLE_FORMATS[format_bits][0] if format_bits in SAMPLE_FORMATS else None
+            path = self._cache_path((frequency, duration, volume), mixer_info)
+
+            sound = None
+            if dtype is not None and self.cache_dir:
+                num_bytes = int(sample_rate * duration) * num_channels * np.dtype(dtype).itemsize
+                sound = self._load_cached(path, dtype, num_bytes)
+
+            if sound is not None:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+                pcm = encode_pcm(synthesize_beep(frequency, duration, volume, sample_rate), format_bits, num_channels)
+                if self.cache_dir:
+                    self._save_cached(path, pcm)
+                sound = pygame.mixer.Sound(buffer=pcm)
 
-            num_samples = int(sample_rate * duration)
-
-            buf = []
-
-            for i in range(num_samples):
-                t = float(i) / sample_rate
-
-                decay = math.exp(-5 * t / duration)
-
-                fade_in_duration = 0.01
-                if t < fade_in_duration:
-                    fade_in = t / fade_in_duration
-                else:
-                    fade_in = 1.0
-
-                value = math.sin(2.0 * math.pi * frequency * t) * decay * fade_in * volume
-
-                sample_value = int(value * 16384)
-
-                sample_bytes = struct.pack('<h', sample_value)
-
-                if num_channels == 2:
-                    buf.append(sample_bytes)
-                    buf.append(sample_bytes)
-                else:
-                    buf.append(sample_bytes)
-
-            sound_buffer = b''.join(buf)
-
-            sound = pygame.mixer.Sound(buffer=sound_buffer)
             sound.set_volume(volume)
 
             return sound
@@ -67,28 +148,14 @@ class SoundGenerator:
             return None
 
     def generate_all_sounds(self):
-        print("🎵 Генерация звуков...")
+        start = time.perf_counter()
 
         try:
-            self.sounds['flap'] = self.create_beep(330, 0.08, 0.4)
-            print("  ✅ Звук взмаха (мягкий)")
-
-            self.sounds['score'] = self.create_beep(523, 0.15, 0.5)
-            print("  ✅ Звук очка (приятный)")
-
-            self.sounds['death'] = self.create_beep(165, 0.4, 0.5)
-            print("  ✅ Звук смерти (низкий)")
-
-            self.sounds['levelup'] = self.create_beep(659, 0.25, 0.6)
-            print("  ✅ Звук повышения уровня (радостный)")
+            for name, (frequency, duration, volume) in SOUND_EFFECTS.items():
+                self.sounds[name] = self.create_beep(frequency, duration, volume)
 
-            self.sounds['menu_select'] = self.create_beep(440, 0.1, 0.4)
-            print("  ✅ Звук выбора в меню (мягкий)")
-
-            self.sounds['menu_move'] = self.create_beep(330, 0.05, 0.3)
-            print("  ✅ Звук навигации в меню (тихий)")
-
-            print("🎵 Все звуки сгенерированы!")
+            print(f"🎵 Звуки готовы: {len(self.sounds)} (из кэша {self.cache_hits}) "
+                  f"за {(time.perf_counter() - start) * 1000:.1f} мс")
 
             print("\n🔊 ТЕСТ ЗВУКОВ:")
             if 'flap' in self.sounds and self.sounds['flap']:
@@ -102,15 +169,68 @@ class SoundGenerator:
             traceback.print_exc()
             self.sound_enabled = False
 
+    def _find_slot(self, category, priority):
+        # Свободный канал категории, иначе самый старый из наименее важных, но не важнее нового звука
+        victim = None
+        for slot in self.channel_groups[category]:
+            if not slot.channel.get_busy():
+                return slot
+            if slot.priority <= priority and (victim is None or (slot.priority, slot.started) <
+                                              (victim.priority, victim.started)):
+                victim = slot
+        return victim
+
     def play(self, sound_name):
-        if not self.sound_enabled:
+        if not self.sound_enabled or self.muted:
+            return
+
+        sound = self.sounds.get(sound_name)
+        if not sound:
+            return
+
+        now = time.perf_counter()
+        last = self.last_played.get(sound_name)
+        if last is not None and now - last < SOUND_COALESCE_WINDOW:
+            self.coalesced[sound_name] += 1
+            return
+
+        category, priority = SOUND_ROUTING.get(sound_name, (None, 0))
+        try:
+            if category not in self.channel_groups:
+                sound.play()
+            else:
+                slot = self._find_slot(category, priority)
+                if slot is None:
+                    self.dropped[sound_name] += 1
+                    return
+                if slot.channel.get_busy():
+                    self.stolen[sound_name] += 1
+                slot.channel.play(sound)
+                slot.priority = priority
+                slot.started = now
+        except Exception as e:
+            print(f"⚠️ Ошибка воспроизведения {sound_name}: {e}")
             return
 
-        if sound_name in self.sounds and self.sounds[sound_name]:
-            try:
-                self.sounds[sound_name].play()
-            except Exception as e:
-                print(f"⚠️ Ошибка воспроизведения {sound_name}: {e}")
+        self.last_played[sound_name] = now
+        self.played[sound_name] += 1
+
+    def set_muted(self, muted):
+        self.muted = muted
+        if muted:
+            for slots in self.channel_groups.values():
+                for slot in slots:
+                    slot.channel.stop()
+
+    def stats(self):
+        return {
+            "played": sum(self.played.values()),
+            "coalesced": sum(self.coalesced.values()),
+            "stolen": sum(self.stolen.values()),
+            "dropped": sum(self.dropped.values()),
+            "by_sound": {name: (self.played[name], self.coalesced[name], self.stolen[name], self.dropped[name])
+                         for name in self.sounds},
+        }
 
     def stop_all(self):
         try:
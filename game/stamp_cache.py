@@ -0,0 +1,97 @@
+
+import pygame
+import math
+from collections import OrderedDict
+from game.constants import *
+
+
+class StampCache:
+
+    def __init__(self, max_entries=STAMP_CACHE_SIZE, alpha_step=STAMP_ALPHA_STEP):
+        self.max_entries = max_entries
+        self.alpha_step = alpha_step
+        self.stamps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory = 0
+
+    def quantize_alpha(self, alpha):
+        if alpha >= 255:
+            return 255
+        if alpha <= 0:
+            return 0
+        return min(255, int(alpha / self.alpha_step + 0.5) * self.alpha_step)
+
+    def _get(self, key, build):
+        stamp = self.stamps.get(key)
+        if stamp is not None:
+            self.stamps.move_to_end(key)
+            self.hits += 1
+            return stamp
+
+        self.misses += 1
+        stamp = build()
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert_alpha()
+        self.stamps[key] = stamp
+        self.memory += stamp.get_width() * stamp.get_height() * stamp.get_bytesize()
+
+        while len(self.stamps) > self.max_entries:
+            _, evicted = self.stamps.popitem(last=False)
+            self.memory -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+            self.evictions += 1
+        return stamp
+
+    def circle(self, radius, color, alpha):
+        alpha = self.quantize_alpha(alpha)
+        key = ("circle", radius, color, alpha)
+
+        def build():
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color[:3], alpha), (radius, radius), radius)
+            return surf
+
+        return self._get(key, build)
+
+    def star(self, size, color, alpha, rays=5):
+        # Звезда в квадрате size*3 с центром в size*1.5, как рисовались эффекты раньше
+        alpha = self.quantize_alpha(alpha)
+        key = ("star", size, rays, color, alpha)
+
+        def build():
+            surf = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+            step = math.pi / rays
+            points = []
+            for i in range(rays * 2):
+                r = size if i % 2 == 0 else size // 2
+                px = int(r * math.cos(i * step)) + size * 1.5
+                py = int(r * math.sin(i * step)) + size * 1.5
+                points.append((px, py))
+            pygame.draw.polygon(surf, (*color[:3], alpha), points)
+            return surf
+
+        return self._get(key, build)
+
+    def stats(self):
+        return {
+            "entries": len(self.stamps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory": self.memory,
+        }
+
+    def clear(self):
+        self.stamps.clear()
+        self.memory = 0
+
+
+_stamp_cache = None
+
+
+def get_stamp_cache():
+    global _stamp_cache
+    if _stamp_cache is None:
+        _stamp_cache = StampCache()
+    return _stamp_cache
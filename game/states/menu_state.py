@@ -4,16 +4,25 @@ import json
 import os
 from game.states.base_state import BaseState
 from game.constants import *
-from game.sound_generator import play_sound
+from game.sound_generator import play_sound, get_sound_generator
+from game.music import get_music_engine
+from game.text_cache import get_text_cache
+from game.gradients import get_gradient_cache
 
 
 class MenuState(BaseState):
 
+    TITLE_FONT = 180
+    MENU_FONT = 120
+    SMALL_FONT = 70
+    HINT_FONT = 50
+    # Размах покачивания заголовка и кругов; по нему же считаются перерисовываемые области
+    BOB_RANGE = 10
+
     def __init__(self, game_manager):
         super().__init__(game_manager)
-        self.title_font = None
-        self.menu_font = None
-        self.small_font = None
+        self.text = get_text_cache()
+        self.gradients = get_gradient_cache()
 
         self.tabs = ["PLAY", "STATS", "SHOP", "SETTINGS"]
         self.current_tab = 0
@@ -23,7 +32,7 @@ class MenuState(BaseState):
         self.shop_tabs = ["SKINS", "LOCATIONS"]
         self.current_shop_tab = 0
         self.shop_scroll = 0
-        self.settings_options = ["SOUND: ON", "FULLSCREEN: OFF", "BACK TO MENU"]
+        self.settings_options = ["SOUND: ON", "FULLSCREEN: OFF", f"PARTICLES: {PARTICLE_COUNT}", "BACK TO MENU"]
 
         self.selected_option = 0
 
@@ -42,6 +51,12 @@ class MenuState(BaseState):
         self.animation_offset = 0
         self.animation_direction = 1
 
+        self.layer_key = None
+        self.base_layer = None
+        self.dynamic_layers = []
+        self.title_sprite = None
+        self.title_rect = None
+
     def load_stats(self):
         stats_file = "stats.json"
         default_stats = {
@@ -148,9 +163,6 @@ class MenuState(BaseState):
             play_sound('menu_select')
 
     def enter(self):
-        self.title_font = pygame.font.Font(None, 180)
-        self.menu_font = pygame.font.Font(None, 120)
-        self.small_font = pygame.font.Font(None, 70)
         self.selected_option = 0
         self.current_tab = 0
         self.current_shop_tab = 0
@@ -266,10 +278,8 @@ class MenuState(BaseState):
         elif selected.startswith("SOUND:"):
             self.sound_enabled = not self.sound_enabled
             self.settings_options[0] = f"SOUND: {'ON' if self.sound_enabled else 'OFF'}"
-            if self.sound_enabled:
-                pygame.mixer.set_num_channels(8)
-            else:
-                pygame.mixer.stop()
+            get_sound_generator().set_muted(not self.sound_enabled)
+            get_music_engine().set_enabled(self.sound_enabled)
             play_sound('menu_select')
 
         elif selected.startswith("FULLSCREEN:"):
@@ -277,41 +287,114 @@ class MenuState(BaseState):
             self.settings_options[1] = f"FULLSCREEN: {'ON' if self.fullscreen_enabled else 'OFF'}"
             pygame.display.toggle_fullscreen()
 
+        elif selected.startswith("PARTICLES:"):
+            levels = PARTICLE_QUALITY_LEVELS
+            current = self.game_manager.particle_count
+            index = levels.index(current) if current in levels else 0
+            count = levels[(index + 1) % len(levels)]
+            self.game_manager.set_particle_count(count)
+            self.settings_options[2] = f"PARTICLES: {count}"
+            play_sound('menu_select')
+
         elif selected == "BACK TO MENU":
             self.current_tab = 0
             self.selected_option = 0
 
     def update(self, dt):
-        self.animation_offset += self.animation_direction * 0.5
-        if abs(self.animation_offset) > 10:
+        self.animation_offset += self.animation_direction * 30 * dt
+        if abs(self.animation_offset) >= self.BOB_RANGE:
+            # Зажимаем, иначе на редких тиках один шаг уводит заголовок за кэшированные области
+            self.animation_offset = max(-self.BOB_RANGE, min(self.BOB_RANGE, self.animation_offset))
             self.animation_direction *= -1
 
     def render(self, screen):
-        self._render_background(screen)
-
+        profile = self.game_manager.profiler.mark
+
+        key = self._layer_key()
+        if key != self.layer_key:
+            self._build_layers()
+            self.layer_key = key
+            profile("layers")
+
+        # Статичный кадр целиком, затем под заголовком и кругами восстанавливаем чистый фон
+        screen.blit(self.base_layer, (0, 0))
+        gradient = self.gradients.vertical(*MENU_GRADIENT)
+        for rect, overlay_rect, overlay in self.dynamic_layers:
+            screen.blit(gradient, rect, rect)
+        profile("background")
+
+        self._render_circles(screen)
         self._render_title(screen)
+        profile("title")
+
+        # Интерфейс поверх анимации, как и при полной перерисовке
+        for rect, overlay_rect, overlay in self.dynamic_layers:
+            if overlay is not None:
+                screen.blit(overlay, overlay_rect)
+        profile("ui")
+
+    def _layer_key(self):
+        return (self.current_tab, self.selected_option, self.current_shop_tab, self.shop_scroll,
+                self.total_coins, tuple(self.owned_skins), tuple(self.owned_locations),
+                self.current_skin, self.current_location, tuple(self.settings_options),
+                tuple(self.stats.values()))
+
+    def _build_layers(self):
+        ui = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self._render_ui(ui)
+
+        self.base_layer = self.gradients.vertical(*MENU_GRADIENT).copy()
+        self.base_layer.blit(ui, (0, 0))
+
+        self.dynamic_layers = []
+        for rect in self._dynamic_rects():
+            # Полностью прозрачные края оверлея не нужны: альфа-блит дорог на каждый пиксель
+            bounds = ui.subsurface(rect).get_bounding_rect()
+            if bounds.width and bounds.height:
+                overlay = ui.subsurface(bounds.move(rect.topleft)).copy()
+                if pygame.display.get_surface() is not None:
+                    overlay = overlay.convert_alpha()
+                self.dynamic_layers.append((rect, bounds.move(rect.topleft), overlay))
+            else:
+                self.dynamic_layers.append((rect, None, None))
+
+    def _dynamic_rects(self):
+        # Области, до которых дотягиваются покачивание заголовка и круги
+        screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        bob = self.BOB_RANGE
+
+        title_rect = self._title_sprite().get_rect(topleft=self.title_rect.topleft).inflate(0, bob * 2)
+
+        circles_rect = None
+        for i in range(5):
+            radius = 30 + i * 10
+            for offset in (-bob, bob):
+                x = (i * 100 + offset * 2) % (SCREEN_WIDTH + 100)
+                rect = pygame.Rect(x - radius, 50 + i * 120 - radius, radius * 2 + 1, radius * 2 + 1).clip(screen_rect)
+                if rect.width and rect.height:
+                    circles_rect = rect if circles_rect is None else circles_rect.union(rect)
+
+        return [title_rect.clip(screen_rect), circles_rect]
+
+    def _render_ui(self, surface):
+        version = self.text.render("v2.3 - Pink Edition", self.SMALL_FONT, WHITE)
+        version_rect = version.get_rect(center=(SCREEN_WIDTH // 2, 220))
+        surface.blit(version, version_rect)
 
-        self._render_tabs(screen)
+        self._render_tabs(surface)
 
         if self.current_tab == 0:
-            self._render_play_tab(screen)
+            self._render_play_tab(surface)
         elif self.current_tab == 1:
-            self._render_stats_tab(screen)
+            self._render_stats_tab(surface)
         elif self.current_tab == 2:
-            self._render_shop_tab(screen)
+            self._render_shop_tab(surface)
         else:
-            self._render_settings_tab(screen)
+            self._render_settings_tab(surface)
 
-        self._render_hints(screen)
-
-    def _render_background(self, screen):
-        for y in range(SCREEN_HEIGHT):
-            ratio = y / SCREEN_HEIGHT
-            r = int(255 - 100 * ratio)
-            g = int(192 - 100 * ratio)
-            b = int(203 - 50 * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        self._render_hints(surface)
 
+    def _render_circles(self, screen):
         for i in range(5):
             x = (i * 100 + int(self.animation_offset * 2)) % (SCREEN_WIDTH + 100)
             y = 50 + i * 120
@@ -319,18 +402,25 @@ class MenuState(BaseState):
             color = (255, 182, 193, 30)
             pygame.draw.circle(screen, LIGHT_PINK, (x, y), radius, 2)
 
-    def _render_title(self, screen):
-        shadow = self.title_font.render("💖 FLAPPY BARBIE 💖", True, (139, 0, 139))
-        shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 5, 105 + int(self.animation_offset)))
-        screen.blit(shadow, shadow_rect)
-
-        title = self.title_font.render("💖 FLAPPY BARBIE 💖", True, HOT_PINK)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100 + int(self.animation_offset)))
-        screen.blit(title, title_rect)
+    def _title_sprite(self):
+        # Заголовок вместе с тенью, чтобы покачивание стоило одного блита
+        if self.title_sprite is None:
+            shadow = self.text.render("💖 FLAPPY BARBIE 💖", self.TITLE_FONT, (139, 0, 139))
+            title = self.text.render("💖 FLAPPY BARBIE 💖", self.TITLE_FONT, HOT_PINK)
+            width, height = title.get_size()
+            # В предумноженной альфе склейка тени и текста даёт тот же результат, что и два блита подряд.
+            # copy() нужен из-за выравнивания строк у поверхностей шрифта: premul_alpha() его не учитывает
+            self.title_sprite = pygame.Surface((width + 5, height + 5), pygame.SRCALPHA)
+            self.title_sprite.blit(shadow.copy().premul_alpha(), (5, 5))
+            self.title_sprite.blit(title.copy().premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self.title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
+            if pygame.display.get_surface() is not None:
+                self.title_sprite = self.title_sprite.convert_alpha()
+        return self.title_sprite
 
-        version = self.small_font.render("v2.3 - Pink Edition", True, WHITE)
-        version_rect = version.get_rect(center=(SCREEN_WIDTH // 2, 220))
-        screen.blit(version, version_rect)
+    def _render_title(self, screen):
+        sprite = self._title_sprite()
+        screen.blit(sprite, self.title_rect.move(0, int(self.animation_offset)), special_flags=pygame.BLEND_PREMULTIPLIED)
 
     def _render_tabs(self, screen):
         tab_y = 300
@@ -349,7 +439,7 @@ class MenuState(BaseState):
                 text_color = LIGHT_PINK
                 pygame.draw.rect(screen, color, (x, tab_y, tab_width, 80))
 
-            text = self.menu_font.render(tab, True, text_color)
+            text = self.text.render(tab, self.MENU_FONT, text_color)
             text_rect = text.get_rect(center=(x + tab_width // 2, tab_y + 40))
             screen.blit(text, text_rect)
 
@@ -364,8 +454,8 @@ class MenuState(BaseState):
                 pygame.draw.rect(screen, GOLD, button_rect, 0, 20)
                 pygame.draw.rect(screen, HOT_PINK, button_rect, 5, 20)
 
-                arrow_left = self.menu_font.render("►", True, HOT_PINK)
-                arrow_right = self.menu_font.render("◄", True, HOT_PINK)
+                arrow_left = self.text.render("►", self.MENU_FONT, HOT_PINK)
+                arrow_right = self.text.render("◄", self.MENU_FONT, HOT_PINK)
                 screen.blit(arrow_left, (SCREEN_WIDTH // 2 - 380, y - 30))
                 screen.blit(arrow_right, (SCREEN_WIDTH // 2 + 320, y - 30))
 
@@ -376,12 +466,12 @@ class MenuState(BaseState):
                 pygame.draw.rect(screen, PURPLE, button_rect, 3, 20)
                 text_color = PURPLE
 
-            text = self.menu_font.render(option, True, text_color)
+            text = self.text.render(option, self.MENU_FONT, text_color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
             screen.blit(text, text_rect)
 
         if self.stats["high_score"] > 0:
-            record_text = self.small_font.render(f"🏆 Best Score: {self.stats['high_score']}", True, GOLD)
+            record_text = self.text.render(f"🏆 Best Score: {self.stats['high_score']}", self.SMALL_FONT, GOLD)
             record_rect = record_text.get_rect(center=(SCREEN_WIDTH // 2, 920))
             screen.blit(record_text, record_rect)
 
@@ -402,8 +492,8 @@ class MenuState(BaseState):
             pygame.draw.rect(screen, LIGHT_PINK, stat_rect, 0, 15)
             pygame.draw.rect(screen, HOT_PINK, stat_rect, 3, 15)
 
-            label_text = self.small_font.render(label, True, PURPLE)
-            value_text = self.small_font.render(str(value), True, DARK_PINK)
+            label_text = self.text.render(label, self.SMALL_FONT, PURPLE)
+            value_text = self.text.render(str(value), self.SMALL_FONT, DARK_PINK)
 
             screen.blit(label_text, (150, y - 10))
             screen.blit(value_text, (SCREEN_WIDTH - 300, y - 10))
@@ -422,12 +512,12 @@ class MenuState(BaseState):
             button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 250, y - 40, 500, 80)
             pygame.draw.rect(screen, color, button_rect, 0, 15)
 
-            text = self.small_font.render(option, True, text_color)
+            text = self.text.render(option, self.SMALL_FONT, text_color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
             screen.blit(text, text_rect)
 
     def _render_shop_tab(self, screen):
-        coin_text = self.menu_font.render(f"💰 {self.total_coins} монет", True, GOLD)
+        coin_text = self.text.render(f"💰 {self.total_coins} монет", self.MENU_FONT, GOLD)
         coin_rect = coin_text.get_rect(center=(SCREEN_WIDTH // 2, 270))
         screen.blit(coin_text, coin_rect)
 
@@ -451,7 +541,7 @@ class MenuState(BaseState):
             pygame.draw.rect(screen, color, tab_rect, 0, 10)
             pygame.draw.rect(screen, HOT_PINK, tab_rect, border, 10)
 
-            text = self.small_font.render(tab, True, text_color)
+            text = self.text.render(tab, self.SMALL_FONT, text_color)
             text_rect = text.get_rect(center=(x + shop_tab_width // 2, shop_tab_y + 30))
             screen.blit(text, text_rect)
 
@@ -491,26 +581,26 @@ class MenuState(BaseState):
             pygame.draw.rect(screen, bg_color, card_rect, 0, 15)
             pygame.draw.rect(screen, border_color, card_rect, 4, 15)
 
-            name_text = self.small_font.render(item_data["name"], True, DARK_PINK if i == self.shop_scroll else PURPLE)
+            name_text = self.text.render(item_data["name"], self.SMALL_FONT, DARK_PINK if i == self.shop_scroll else PURPLE)
             screen.blit(name_text, (SCREEN_WIDTH // 2 - 420, y - 40))
 
             if owned:
                 if selected:
-                    status_text = self.small_font.render("✓ ВЫБРАНО", True, GREEN)
+                    status_text = self.text.render("✓ ВЫБРАНО", self.SMALL_FONT, GREEN)
                 else:
-                    status_text = self.small_font.render("КУПЛ  ЕНО - НАЖМИ ENTER", True, HOT_PINK)
+                    status_text = self.text.render("КУПЛ  ЕНО - НАЖМИ ENTER", self.SMALL_FONT, HOT_PINK)
             else:
-                price_text = self.small_font.render(f"💰 {item_data['price']} монет", True, GOLD)
+                price_text = self.text.render(f"💰 {item_data['price']} монет", self.SMALL_FONT, GOLD)
                 status_text = price_text
 
             screen.blit(status_text, (SCREEN_WIDTH // 2 - 420, y + 10))
 
         if self.shop_scroll > 0:
-            arrow_up = self.menu_font.render("▲", True, HOT_PINK)
+            arrow_up = self.text.render("▲", self.MENU_FONT, HOT_PINK)
             screen.blit(arrow_up, (SCREEN_WIDTH // 2 - 60, start_y - 100))
 
         if self.shop_scroll < len(item_ids) - 1:
-            arrow_down = self.menu_font.render("▼", True, HOT_PINK)
+            arrow_down = self.text.render("▼", self.MENU_FONT, HOT_PINK)
             screen.blit(arrow_down, (SCREEN_WIDTH // 2 - 60, start_y + 400))
 
     def _render_settings_tab(self, screen):
@@ -526,8 +616,8 @@ class MenuState(BaseState):
                 text_color = DARK_PINK
 
                 if "BACK" not in option:
-                    arrow_left = self.small_font.render("◄", True, HOT_PINK)
-                    arrow_right = self.small_font.render("►", True, HOT_PINK)
+                    arrow_left = self.text.render("◄", self.SMALL_FONT, HOT_PINK)
+                    arrow_right = self.text.render("►", self.SMALL_FONT, HOT_PINK)
                     screen.blit(arrow_left, (SCREEN_WIDTH // 2 - 380, y - 20))
                     screen.blit(arrow_right, (SCREEN_WIDTH // 2 + 320, y - 20))
             else:
@@ -536,7 +626,7 @@ class MenuState(BaseState):
                 pygame.draw.rect(screen, PURPLE, button_rect, 3, 20)
                 text_color = PURPLE
 
-            text = self.small_font.render(option, True, text_color)
+            text = self.text.render(option, self.SMALL_FONT, text_color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
             screen.blit(text, text_rect)
 
@@ -545,13 +635,15 @@ class MenuState(BaseState):
             "← → Switch Tabs",
             "↑ ↓ Navigate",
             "ENTER Select",
-            "F11 Fullscreen"
+            "F11 Fullscreen",
+            "F10 Scaling",
+            "F3 Profiler"
         ]
 
         hint_y = SCREEN_HEIGHT - 40
         hint_x = 20
 
         for hint in hints:
-            text = pygame.font.Font(None, 50).render(hint, True, WHITE)
+            text = self.text.render(hint, self.HINT_FONT, WHITE)
             screen.blit(text, (hint_x, hint_y))
-            hint_x += 120
+            hint_x += text.get_width() + 40
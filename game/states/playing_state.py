@@ -9,18 +9,23 @@ from game.entities.flappy_barbie import FlappyBarbie
 from game.entities.coin import CoinManager
 from game.world.pipes import PipeManager
 from game.sound_generator import play_sound
+from game.music import get_music_engine
+from game.assets import get_assets
+from game.text_cache import get_text_cache
+from game.gradients import get_gradient_cache
 from game.effects import ParticleSystem, BackgroundStars, RainbowEffect, ScoreEffect
 
 
 class PlayingState(BaseState):
+    _ground_strip = None
+
     def __init__(self, game_manager):
         super().__init__(game_manager)
         self.barbie = None
         self.pipe_manager = None
         self.coin_manager = None
         self.paused = False
-        self.ui_font = None
-        self.title_font = None
+        self.text = get_text_cache()
         self.game_started = False
         self.particle_system = None
         self.background_stars = None
@@ -30,17 +35,19 @@ class PlayingState(BaseState):
         self.coins_collected = 0
         self.current_skin = "default"
         self.current_location = "default"
-        self.current_fps = 60
 
     def enter(self):
-        self.ui_font = pygame.font.Font(None, 180)
-        self.title_font = pygame.font.Font(None, 120)
         self._load_shop_settings()
         self.barbie = FlappyBarbie(100, BARBIE_START_Y)
         self._apply_skin()
-        self.pipe_manager = PipeManager()
-        self.coin_manager = CoinManager()
-        self.particle_system = ParticleSystem()
+        # Менеджеры переживают забеги, чтобы их пулы труб и монет не пересоздавались
+        if self.pipe_manager is None:
+            self.pipe_manager = PipeManager()
+            self.coin_manager = CoinManager()
+        else:
+            self.pipe_manager.reset()
+            self.coin_manager.reset()
+        self.particle_system = ParticleSystem(self.game_manager.particle_count)
         self.background_stars = BackgroundStars()
         self.rainbow_effect = RainbowEffect()
         self.score_effect = ScoreEffect()
@@ -48,15 +55,18 @@ class PlayingState(BaseState):
         self.paused = False
         self.game_started = False
         self.coins_collected = 0
+        self.ground_offset = 0
+        self.prev_ground_offset = 0
+        if PlayingState._ground_strip is None:
+            PlayingState._bake_ground()
 
         self.coin_icon = None
         try:
-            self.coin_icon = pygame.image.load("assets/images/money.png").convert_alpha()
-            self.coin_icon = pygame.transform.scale(self.coin_icon, (60, 60))
+            self.coin_icon = get_assets().scaled(f"{IMAGES_DIR}/money.png", (60, 60))
         except:
             pass
 
-        self.background_surface = self._create_background_surface()
+        self.background_surface = get_gradient_cache().location(self.current_location)
 
     def _load_shop_settings(self):
         try:
@@ -73,11 +83,9 @@ class PlayingState(BaseState):
             skin_data = SKINS.get(self.current_skin)
             if skin_data and skin_data.get("file"):
                 try:
-                    skin_path = f"assets/images/{skin_data['file']}"
-                    skin_image = pygame.image.load(skin_path).convert_alpha()
-                    skin_image = pygame.transform.scale(skin_image, (BARBIE_SIZE, BARBIE_SIZE))
-                    self.barbie.sprite = skin_image
-                    self.barbie.has_sprite = True
+                    skin_path = f"{IMAGES_DIR}/{skin_data['file']}"
+                    skin_image = get_assets().scaled(skin_path, (BARBIE_SIZE, BARBIE_SIZE))
+                    self.barbie.set_skin(self.current_skin, skin_image)
                     print(f"✅ Применён скин: {skin_data['name']}")
                 except Exception as e:
                     print(f"❌ Ошибка загрузки скина {self.current_skin}: {e}")
@@ -100,8 +108,6 @@ class PlayingState(BaseState):
         if self.paused:
             return
 
-        self.current_fps = int(1 / dt) if dt > 0 else 60
-
         self.particle_system.update(dt)
         self.background_stars.update(dt)
         self.rainbow_effect.update(dt)
@@ -115,16 +121,18 @@ class PlayingState(BaseState):
                 for _ in range(COINS_PER_SCORE):
                     self.coins_collected += 1
             self.coin_manager.update(dt, self.barbie)
+            self._scroll_ground(dt)
         if not self.barbie.is_alive:
             play_sound('death')
             self._save_collected_coins()
-            self._show_screamer()
-            pygame.time.wait(1000)
+            if not self.game_manager.headless:
+                self._show_screamer()
+                self._wait(1000)
             self.game_manager.score = self.pipe_manager.score
             self.game_manager.change_state(GAME_STATE_GAME_OVER)
 
     def _save_collected_coins(self):
-        if self.coins_collected > 0:
+        if self.coins_collected > 0 and not self.game_manager.headless:
             try:
                 shop_file = "shop.json"
                 shop_data = {}
@@ -140,83 +148,99 @@ class PlayingState(BaseState):
                 pass
 
     def render(self, screen):
+        alpha = self.game_manager.interpolation
+        profile = self.game_manager.profiler.mark
+
         self._render_background(screen)
+        profile("background")
         self.rainbow_effect.render(screen)
+        profile("rainbow")
         self.background_stars.render(screen)
+        profile("stars")
         self.particle_system.render(screen)
-        self.pipe_manager.render(screen)
+        profile("particles")
+        self.pipe_manager.render(screen, alpha)
+        profile("pipes")
         self.coin_manager.render(screen)
-        self._render_ground(screen)
-        self.barbie.render(screen)
+        profile("coins")
+        self._render_ground(screen, alpha)
+        profile("ground")
+        self.barbie.render(screen, alpha)
+        profile("barbie")
         self.score_effect.render(screen)
-        score_text = self.ui_font.render(str(self.pipe_manager.score), True, GOLD)
-        score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        shadow_text = self.ui_font.render(str(self.pipe_manager.score), True, DARK_PINK)
-        shadow_rect = shadow_text.get_rect(center=(SCREEN_WIDTH // 2 + 5, 105))
-        screen.blit(shadow_text, shadow_rect)
-        screen.blit(score_text, score_rect)
-        coin_font = pygame.font.Font(None, 90)
+        profile("score_effect")
+        self.text.blit_number(screen, self.pipe_manager.score, 180, DARK_PINK, (SCREEN_WIDTH // 2 + 5, 105))
+        self.text.blit_number(screen, self.pipe_manager.score, 180, GOLD, (SCREEN_WIDTH // 2, 100))
 
         if self.coin_icon:
             screen.blit(self.coin_icon, (30, 25))
-            coin_text = coin_font.render(f"{self.coins_collected}", True, GOLD)
-            screen.blit(coin_text, (110, 30))
+            self.text.blit_number(screen, self.coins_collected, 90, GOLD, topleft=(110, 30))
         else:
-            coin_text = coin_font.render(f"💰 {self.coins_collected}", True, GOLD)
+            coin_text = self.text.render(f"💰 {self.coins_collected}", 90, GOLD)
             screen.blit(coin_text, (30, 30))
         if self.pipe_manager.difficulty_level > 1:
-            diff_font = pygame.font.Font(None, 90)
-            diff_text = diff_font.render(f"Level {self.pipe_manager.difficulty_level}", True, PURPLE)
+            diff_text = self.text.render(f"Level {self.pipe_manager.difficulty_level}", 90, PURPLE)
             screen.blit(diff_text, (SCREEN_WIDTH - 250, 30))
-
-        fps_font = pygame.font.Font(None, 50)
-        fps_color = WHITE if self.current_fps >= 50 else RED
-        fps_text = fps_font.render(f"FPS: {self.current_fps}", True, fps_color)
-        screen.blit(fps_text, (SCREEN_WIDTH - 150, SCREEN_HEIGHT - 50))
         if not self.game_started:
-            hint_text = self.title_font.render("SPACE / CLICK", True, WHITE)
+            hint_text = self.text.render("SPACE / CLICK", 120, WHITE)
             hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             screen.blit(hint_text, hint_rect)
-            hint2_text = self.title_font.render("to FLY!", True, HOT_PINK)
+            hint2_text = self.text.render("to FLY!", 120, HOT_PINK)
             hint2_rect = hint2_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             screen.blit(hint2_text, hint2_rect)
-
-    def _create_background_surface(self):
-        bg_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT))
-        location_data = LOCATIONS.get(self.current_location, LOCATIONS["default"])
-        colors = location_data["colors"]
-
-        for y in range(SCREEN_HEIGHT - GROUND_HEIGHT):
-            ratio = y / (SCREEN_HEIGHT - GROUND_HEIGHT)
-            r = int(colors[0][0] + (colors[1][0] - colors[0][0]) * ratio)
-            g = int(colors[0][1] + (colors[1][1] - colors[0][1]) * ratio)
-            b = int(colors[0][2] + (colors[1][2] - colors[0][2]) * ratio)
-            pygame.draw.line(bg_surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-
-        return bg_surface
+        profile("hud")
 
     def _render_background(self, screen):
         screen.blit(self.background_surface, (0, 0))
 
-    def _render_ground(self, screen):
-        ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
-        pygame.draw.rect(screen, DARK_PINK, (0, ground_y, SCREEN_WIDTH, GROUND_HEIGHT))
-        pygame.draw.rect(screen, HOT_PINK, (0, ground_y, SCREEN_WIDTH, 5))
-        heart_spacing = 100
-        for x in range(0, SCREEN_WIDTH, heart_spacing):
-            self._draw_heart(screen, x + 50, ground_y + 50, 20)
+    @classmethod
+    def _bake_ground(cls):
+        strip = pygame.Surface((SCREEN_WIDTH + GROUND_HEART_SPACING, GROUND_HEIGHT))
+        strip.fill(DARK_PINK)
+        pygame.draw.rect(strip, HOT_PINK, (0, 0, strip.get_width(), 5))
+        for x in range(0, strip.get_width(), GROUND_HEART_SPACING):
+            cls._draw_heart(strip, x + GROUND_HEART_SPACING // 2, 50, 20)
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert()
+        cls._ground_strip = strip
+
+    def _scroll_ground(self, dt):
+        if not GROUND_SCROLL or not self.barbie.is_alive:
+            return
+        self.prev_ground_offset = self.ground_offset
+        self.ground_offset += self.pipe_manager.current_speed * dt
+        if self.ground_offset >= GROUND_HEART_SPACING:
+            self.ground_offset -= GROUND_HEART_SPACING
+            self.prev_ground_offset -= GROUND_HEART_SPACING
+
+    def _render_ground(self, screen, alpha=1.0):
+        # Узор повторяется с периодом GROUND_HEART_SPACING, поэтому хватает одного блита со сдвигом окна
+        offset = self.prev_ground_offset + (self.ground_offset - self.prev_ground_offset) * alpha
+        area = (int(offset) % GROUND_HEART_SPACING, 0, SCREEN_WIDTH, GROUND_HEIGHT)
+        screen.blit(PlayingState._ground_strip, (0, SCREEN_HEIGHT - GROUND_HEIGHT), area)
 
-    def _draw_heart(self, screen, x, y, size):
+    @staticmethod
+    def _draw_heart(screen, x, y, size):
         pygame.draw.circle(screen, HOT_PINK, (x - size//2, y), size//2)
         pygame.draw.circle(screen, HOT_PINK, (x + size//2, y), size//2)
         points = [(x - size, y), (x, y + size), (x + size, y)]
         pygame.draw.polygon(screen, HOT_PINK, points)
 
+    @staticmethod
+    def _wait(ms):
+        # Кадровый цикл стоит, поэтому паузу режем на короткие и подкладываем музыке куски сами
+        music = get_music_engine()
+        while ms > 0:
+            step = min(ms, MUSIC_PUMP_INTERVAL)
+            pygame.time.wait(step)
+            music.update()
+            ms -= step
+
     def _show_screamer(self):
         screen = self.game_manager.screen
         current_screen = screen.copy()
         try:
-            barbie_sprite = pygame.image.load("assets/images/barbi.gif").convert_alpha()
+            barbie_sprite = get_assets().image(f"{IMAGES_DIR}/barbi.gif")
             screamer_size = min(SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT)
         except:
             barbie_sprite = None
@@ -237,8 +261,7 @@ class PlayingState(BaseState):
                 y = (SCREEN_HEIGHT - GROUND_HEIGHT - scaled_size) // 2 + shake_y
                 screen.blit(scaled_barbie, (x, y))
             else:
-                screamer_font = pygame.font.Font(None, 400)
-                text = screamer_font.render("GAME OVER!", True, (255, 255, 255))
+                text = self.text.render("GAME OVER!", 400, (255, 255, 255))
                 text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
                 shake_x = random.randint(-15, 15)
                 shake_y = random.randint(-15, 15)
@@ -246,4 +269,4 @@ class PlayingState(BaseState):
                 text_rect.y += shake_y
                 screen.blit(text, text_rect)
             pygame.display.flip()
-            pygame.time.wait(80)
+            self._wait(80)
@@ -0,0 +1,97 @@
+
+import pygame
+from collections import OrderedDict
+from game.constants import *
+
+
+class TextCache:
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.digits = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, alpha=255):
+        if alpha < 255:
+            alpha = max(0, int(alpha / TEXT_ALPHA_STEP + 0.5) * TEXT_ALPHA_STEP)
+        key = (size, text, color, alpha)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if alpha < 255:
+            surface = self.render(text, size, color).copy()
+            surface.set_alpha(alpha)
+        else:
+            surface = self.font(size).render(text, True, color)
+        self.texts[key] = surface
+        while len(self.texts) > self.max_entries:
+            self.texts.popitem(last=False)
+        return surface
+
+    def _digit_glyphs(self, size, color):
+        key = (size, color)
+        glyphs = self.digits.get(key)
+        if glyphs is None:
+            font = self.font(size)
+            glyphs = [font.render(str(digit), True, color) for digit in range(10)]
+            self.digits[key] = glyphs
+        return glyphs
+
+    def blit_number(self, screen, value, size, color, center=None, topleft=None):
+        # Быстрый путь для счёта: цифры рендерятся один раз и собираются блитами
+        glyphs = self._digit_glyphs(size, color)
+        digits = str(value)
+        if not digits.isdigit():
+            surface = self.render(digits, size, color)
+            if center is not None:
+                return screen.blit(surface, surface.get_rect(center=center))
+            return screen.blit(surface, topleft)
+
+        width = 0
+        for digit in digits:
+            width += glyphs[ord(digit) - 48].get_width()
+        height = glyphs[0].get_height()
+        if center is not None:
+            left = center[0] - width // 2
+            top = center[1] - height // 2
+        else:
+            left, top = topleft
+
+        x = left
+        for digit in digits:
+            glyph = glyphs[ord(digit) - 48]
+            screen.blit(glyph, (x, top))
+            x += glyph.get_width()
+        return pygame.Rect(left, top, width, height)
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "entries": len(self.texts),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_text_cache = None
+
+
+def get_text_cache():
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
@@ -0,0 +1,35 @@
+
+from game.constants import *
+
+
+class FixedTimestep:
+
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_CATCHUP_STEPS):
+        self.step = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_time):
+        if frame_time > MAX_FRAME_TIME:
+            self.dropped_time += frame_time - MAX_FRAME_TIME
+            frame_time = MAX_FRAME_TIME
+
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps:
+            self.accumulator -= self.step
+            steps += 1
+
+        if self.accumulator >= self.step:
+            leftover = self.accumulator % self.step
+            self.dropped_time += self.accumulator - leftover
+            self.accumulator = leftover
+
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 1.0
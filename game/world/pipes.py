@@ -1,36 +1,110 @@
 
 import pygame
 import random
+from collections import deque
 from game.constants import *
 from game.sound_generator import play_sound
+from game.assets import get_assets
+from game.stamp_cache import get_stamp_cache
+
+
+def sweep_rect(box, dx, dy, target):
+    # Момент входа (0..1) прямоугольника box, сдвигающегося за шаг на (dx, dy), в неподвижный target
+    if dx > 0:
+        x_entry = (target.left - box.right) / dx
+        x_exit = (target.right - box.left) / dx
+    elif dx < 0:
+        x_entry = (target.right - box.left) / dx
+        x_exit = (target.left - box.right) / dx
+    elif box.right <= target.left or box.left >= target.right:
+        return None
+    else:
+        x_entry, x_exit = float("-inf"), float("inf")
+
+    if dy > 0:
+        y_entry = (target.top - box.bottom) / dy
+        y_exit = (target.bottom - box.top) / dy
+    elif dy < 0:
+        y_entry = (target.bottom - box.top) / dy
+        y_exit = (target.top - box.bottom) / dy
+    elif box.bottom <= target.top or box.top >= target.bottom:
+        return None
+    else:
+        y_entry, y_exit = float("-inf"), float("inf")
+
+    entry = max(x_entry, y_entry)
+    exit_time = min(x_exit, y_exit)
+    if entry >= exit_time or entry > 1 or exit_time <= 0:
+        return None
+    return max(0.0, entry)
 
 
 class Pipe:
 
-    def __init__(self, x):
+    __slots__ = ("x", "prev_x", "width", "gap_y", "top_height", "bottom_y", "bottom_height",
+                 "top_rect", "bottom_rect", "passed", "top_area", "bottom_area", "has_sprite")
+
+    _column = None
+    _solid_mask = None
+
+    def __init__(self, x, gap=PIPE_GAP):
+        self.top_rect = pygame.Rect(0, 0, 0, 0)
+        self.bottom_rect = pygame.Rect(0, 0, 0, 0)
+        self.top_area = pygame.Rect(0, 0, 0, 0)
+        self.bottom_area = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, gap)
+
+    def reset(self, x, gap=PIPE_GAP):
+        # Вызывается и для новой трубы, и для трубы из пула
         self.x = x
+        self.prev_x = x
         self.width = PIPE_WIDTH
 
         self.gap_y = random.randint(150, SCREEN_HEIGHT - GROUND_HEIGHT - 150)
 
-        self.top_height = self.gap_y - PIPE_GAP // 2
-        self.bottom_y = self.gap_y + PIPE_GAP // 2
+        self.top_height = self.gap_y - gap // 2
+        self.bottom_y = self.gap_y + gap // 2
         self.bottom_height = SCREEN_HEIGHT - GROUND_HEIGHT - self.bottom_y
 
-        self.top_rect = pygame.Rect(self.x, 0, self.width, self.top_height)
-        self.bottom_rect = pygame.Rect(self.x, self.bottom_y, self.width, self.bottom_height)
+        self.top_rect.update(self.x, 0, self.width, self.top_height)
+        self.bottom_rect.update(self.x, self.bottom_y, self.width, self.bottom_height)
 
         self.passed = False
 
         try:
-            self.pipe_sprite = pygame.image.load("assets/images/closet.png").convert_alpha()
+            column = self._get_column()
+            # Обе половины - вырезки одной колонны: верхняя прижата к её низу, нижняя к верху,
+            # так что у проёма всегда оказывается край шкафа
+            self.top_area.update(0, column.get_height() - int(self.top_height), self.width, int(self.top_height))
+            self.bottom_area.update(0, 0, self.width, int(self.bottom_height))
             self.has_sprite = True
         except:
             self.has_sprite = False
 
+    @staticmethod
+    def _get_column():
+        # Шкафы, сложенные стопкой на всю высоту игрового поля; собирается один раз на все трубы
+        if Pipe._column is None:
+            pipe_sprite = get_assets().image(f"{IMAGES_DIR}/closet.png")
+            # Фон картинки (цвет угла) обрезаем, иначе между шкафами в стопке останутся полосы
+            content = pygame.mask.from_threshold(pipe_sprite, pipe_sprite.get_at((0, 0)), (16, 16, 16, 255))
+            content.invert()
+            bounds = content.get_bounding_rects()
+            area = bounds[0].unionall(bounds[1:]) if bounds else pipe_sprite.get_rect()
+
+            tile_height = max(1, round(PIPE_WIDTH * area.height / area.width))
+            tile = pygame.transform.scale(pipe_sprite.subsurface(area), (PIPE_WIDTH, tile_height))
+            tiles = -(-(SCREEN_HEIGHT - GROUND_HEIGHT) // tile_height)
+            column = pygame.Surface((PIPE_WIDTH, tiles * tile_height), tile.get_flags() & pygame.SRCALPHA, tile)
+            for i in range(tiles):
+                column.blit(tile, (0, i * tile_height))
+            Pipe._column = column
+        return Pipe._column
+
     def update(self, dt, speed=None):
         if speed is None:
             speed = PIPE_SPEED
+        self.prev_x = self.x
         self.x -= speed * dt
 
         self.top_rect.x = int(self.x)
@@ -39,52 +113,87 @@ class Pipe:
     def is_off_screen(self):
         return self.x + self.width < 0
 
-    def collides_with(self, barbie_rect):
-        return barbie_rect.colliderect(self.top_rect) or barbie_rect.colliderect(self.bottom_rect)
+    def collides_with(self, barbie_rect, mask=None, mask_pos=(0, 0)):
+        if mask is None:
+            return barbie_rect.colliderect(self.top_rect) or barbie_rect.colliderect(self.bottom_rect)
+
+        # Шкафы непрозрачные, поэтому половина трубы - сплошная маска в высоту экрана, придвинутая к проёму
+        if Pipe._solid_mask is None:
+            Pipe._solid_mask = pygame.Mask((PIPE_WIDTH, SCREEN_HEIGHT), fill=True)
+        left, top = mask_pos
+        x = self.top_rect.x - left
+        if self.top_height > 0 and mask.overlap(Pipe._solid_mask, (x, int(self.top_height) - SCREEN_HEIGHT - top)):
+            return True
+        if self.bottom_height > 0 and mask.overlap(Pipe._solid_mask, (x, int(self.bottom_y) - top)):
+            return True
+        return False
+
+    def time_of_impact(self, barbie_rect, mask, mask_pos, dy):
+        # В системе отсчёта трубы она стоит на месте, а Барби за шаг проезжает вправо
+        # на пройденное трубой расстояние и смещается по y на собственный ход
+        dx = self.prev_x - self.x
+        left, top = mask_pos
+        width, height = mask.get_size() if mask is not None else barbie_rect.size
+        box = pygame.Rect(int(left - dx), int(top - dy), width, height)
+        if box.left >= self.top_rect.right or box.right + dx <= self.top_rect.left:
+            return None
+
+        entry = None
+        for rect, exists in ((self.top_rect, self.top_height > 0), (self.bottom_rect, self.bottom_height > 0)):
+            if exists:
+                t = sweep_rect(box, dx, dy, rect)
+                if t is not None and (entry is None or t < entry):
+                    entry = t
+        if entry is None or mask is None:
+            return entry
+
+        # Коробки пересеклись, уточняем момент удара маской вдоль оставшегося пути
+        # Начальное положение уже проверено на прошлом тике с той маской, которая тогда была
+        samples = int(max(abs(dx), abs(dy)) * (1 - entry) / SWEEP_SAMPLE_STEP) + 1
+        for i in range(1 if entry == 0 else 0, samples + 1):
+            t = entry + (1 - entry) * i / samples
+            position = (int(left - dx * (1 - t)), int(top - dy * (1 - t)))
+            if self.collides_with(barbie_rect, mask, position):
+                return t
+        return None
+
+    def render(self, screen, alpha=1.0):
+        x = int(self.prev_x + (self.x - self.prev_x) * alpha)
 
-    def render(self, screen):
         if self.has_sprite:
-            try:
-                top_sprite = pygame.transform.scale(self.pipe_sprite, (self.width, int(self.top_height)))
-                screen.blit(top_sprite, (int(self.x), 0))
-
-                bottom_sprite = pygame.transform.scale(self.pipe_sprite, (self.width, int(self.bottom_height)))
-                screen.blit(bottom_sprite, (int(self.x), int(self.bottom_y)))
-            except:
-                self._render_fallback(screen)
+            if self.top_height > 0:
+                screen.blit(Pipe._column, (x, 0), self.top_area)
+            if self.bottom_height > 0:
+                screen.blit(Pipe._column, (x, int(self.bottom_y)), self.bottom_area)
         else:
-            self._render_fallback(screen)
+            self._render_fallback(screen, x)
 
-        self._render_stars(screen)
+        self._render_stars(screen, x)
 
-    def _render_fallback(self, screen):
-        pygame.draw.rect(screen, PURPLE, (int(self.x), 0, self.width, int(self.top_height)))
-        pygame.draw.rect(screen, DARK_PINK, (int(self.x), 0, self.width, int(self.top_height)), 3)
+    def _render_fallback(self, screen, x):
+        pygame.draw.rect(screen, PURPLE, (x, 0, self.width, int(self.top_height)))
+        pygame.draw.rect(screen, DARK_PINK, (x, 0, self.width, int(self.top_height)), 3)
 
-        pygame.draw.rect(screen, PURPLE, (int(self.x), int(self.bottom_y), self.width, int(self.bottom_height)))
-        pygame.draw.rect(screen, DARK_PINK, (int(self.x), int(self.bottom_y), self.width, int(self.bottom_height)), 3)
+        pygame.draw.rect(screen, PURPLE, (x, int(self.bottom_y), self.width, int(self.bottom_height)))
+        pygame.draw.rect(screen, DARK_PINK, (x, int(self.bottom_y), self.width, int(self.bottom_height)), 3)
 
-    def _render_stars(self, screen):
+    def _render_stars(self, screen, x):
         star_y = self.gap_y
         for i in range(3):
             offset_x = (i - 1) * 25
-            self._draw_star(screen, int(self.x + self.width // 2 + offset_x), int(star_y), 8)
+            self._draw_star(screen, int(x + self.width // 2 + offset_x), int(star_y), 8)
 
     def _draw_star(self, screen, x, y, size):
-        points = []
-        for i in range(10):
-            angle = i * 36 * 3.14159 / 180
-            r = size if i % 2 == 0 else size // 2
-            px = x + int(r * pygame.math.Vector2(1, 0).rotate_rad(angle).x)
-            py = y + int(r * pygame.math.Vector2(1, 0).rotate_rad(angle).y)
-            points.append((px, py))
-        pygame.draw.polygon(screen, GOLD, points)
+        star_surf = get_stamp_cache().star(size, GOLD, 255, 5)
+        screen.blit(star_surf, (x - size*1.5, y - size*1.5))
 
 
 class PipeManager:
 
     def __init__(self):
-        self.pipes = []
+        # Трубы идут слева направо по x: новые добавляются справа, ушедшие за экран снимаются слева
+        self.pipes = deque()
+        self.pool = []
         self.spawn_timer = 0
         self.spawn_delay = PIPE_SPACING / PIPE_SPEED
         self.score = 0
@@ -94,13 +203,23 @@ class PipeManager:
         self.difficulty_level = 1
 
     def reset(self):
-        self.pipes = []
+        self.pool.extend(self.pipes)
+        self.pipes.clear()
         self.spawn_timer = 0
+        self.spawn_delay = PIPE_SPACING / PIPE_SPEED
         self.score = 0
         self.current_speed = PIPE_SPEED
         self.current_gap = PIPE_GAP
         self.difficulty_level = 1
 
+    def _spawn(self):
+        if self.pool:
+            pipe = self.pool.pop()
+            pipe.reset(SCREEN_WIDTH, self.current_gap)
+        else:
+            pipe = Pipe(SCREEN_WIDTH, self.current_gap)
+        self.pipes.append(pipe)
+
     def update(self, dt, barbie):
         if self.score > 0 and self.score % 5 == 0:
             new_level = (self.score // 5) + 1
@@ -111,28 +230,33 @@ class PipeManager:
         self.spawn_timer += dt
         if self.spawn_timer >= self.spawn_delay:
             self.spawn_timer = 0
-            new_pipe = Pipe(SCREEN_WIDTH)
-            new_pipe.gap_y = random.randint(150, SCREEN_HEIGHT - GROUND_HEIGHT - 150)
-            new_pipe.top_height = new_pipe.gap_y - self.current_gap // 2
-            new_pipe.bottom_y = new_pipe.gap_y + self.current_gap // 2
-            new_pipe.bottom_height = SCREEN_HEIGHT - GROUND_HEIGHT - new_pipe.bottom_y
-            new_pipe.top_rect = pygame.Rect(new_pipe.x, 0, new_pipe.width, new_pipe.top_height)
-            new_pipe.bottom_rect = pygame.Rect(new_pipe.x, new_pipe.bottom_y, new_pipe.width, new_pipe.bottom_height)
-            self.pipes.append(new_pipe)
-
-        for pipe in self.pipes[:]:
-            pipe.update(dt, self.current_speed)
+            self._spawn()
+
+        # Узкая фаза только для труб, чей путь за шаг перекрывает Барби по x
+        # Путь за шаг берётся без упора в землю: удар о трубу до касания земли важнее
+        sweep = barbie.is_alive or barbie.ground_time is not None
+        mask, mask_left, mask_top = barbie.collision_mask(barbie.step_end_y)
+        barbie_dy = barbie.step_end_y - barbie.prev_y
+        impact = None
 
-            if pipe.is_off_screen():
-                self.pipes.remove(pipe)
+        for pipe in self.pipes:
+            pipe.update(dt, self.current_speed)
 
             if not pipe.passed and pipe.x + pipe.width < barbie.x:
                 pipe.passed = True
                 self.score += 1
                 play_sound('score')
 
-            if barbie.is_alive and pipe.collides_with(barbie.rect):
-                barbie.is_alive = False
+            if sweep:
+                t = pipe.time_of_impact(barbie.rect, mask, (mask_left, mask_top), barbie_dy)
+                if t is not None and (impact is None or t < impact):
+                    impact = t
+
+        if impact is not None and (barbie.ground_time is None or impact < barbie.ground_time):
+            barbie.hit(impact)
+
+        while self.pipes and self.pipes[0].is_off_screen():
+            self.pool.append(self.pipes.popleft())
 
     def _increase_difficulty(self):
         self.current_speed = min(PIPE_SPEED + (self.difficulty_level - 1) * 15, 250)
@@ -143,6 +267,6 @@ class PipeManager:
 
         play_sound('levelup')
 
-    def render(self, screen):
+    def render(self, screen, alpha=1.0):
         for pipe in self.pipes:
-            pipe.render(screen)
+            pipe.render(screen, alpha)
@@ -1,78 +1,90 @@
 ﻿import pygame
 import sys
 from game.game_manager import GameManager
-from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GAME_TITLE, FULLSCREEN, RESIZABLE
+from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_FPS, GAME_TITLE
+from game.constants import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER, MIXER_NUM_CHANNELS
 from game.sound_generator import get_sound_generator
+from game.music import get_music_engine
+from game.presenter import Presenter
+from game.timestep import FixedTimestep
+from game.profiler import FrameProfiler
+from game.assets import get_assets
+from game.effects import RainbowEffect
 
 def main():
     pygame.init()
 
     try:
         pygame.mixer.quit()
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-        pygame.mixer.set_num_channels(16)
+        pygame.mixer.init(frequency=MIXER_FREQUENCY, size=MIXER_SIZE, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER)
+        pygame.mixer.set_num_channels(MIXER_NUM_CHANNELS)
         print("🔊 Звуковая система готова!")
     except Exception as e:
         print(f"⚠️ Ошибка звука: {e}")
 
-    is_fullscreen = FULLSCREEN
-
-    if is_fullscreen:
-        display_info = pygame.display.Info()
-        screen_w, screen_h = display_info.current_w, display_info.current_h
-        screen = pygame.display.set_mode((screen_w, screen_h), pygame.FULLSCREEN | pygame.NOFRAME)
+    presenter = Presenter((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen_w, screen_h = presenter.screen.get_size()
+    if presenter.fullscreen:
         print(f"🖥️ Полноэкранный режим {screen_w}x{screen_h}")
     else:
-        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        print(f"🪟 Оконный режим {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        print(f"🪟 Оконный режим {screen_w}x{screen_h}")
 
     game_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption(GAME_TITLE)
+    get_assets().preload()
+    RainbowEffect.preload()
 
     sound_gen = get_sound_generator()
+    music = get_music_engine()
+    music.start()
     clock = pygame.time.Clock()
-    game_manager = GameManager(game_surface)
+    timestep = FixedTimestep()
+    profiler = FrameProfiler()
+    game_manager = GameManager(game_surface, profiler=profiler)
 
     running = True
     while running:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEORESIZE:
+                presenter.handle_resize()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_F11:
-                    is_fullscreen = not is_fullscreen
-                    if is_fullscreen:
-                        display_info = pygame.display.Info()
-                        screen = pygame.display.set_mode(
-                            (display_info.current_w, display_info.current_h),
-                            pygame.FULLSCREEN | pygame.NOFRAME
-                        )
+                    if presenter.toggle_fullscreen():
                         print("🖥️ Полный экран включен")
                     else:
-                        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
                         print("🪟 Оконный режим")
+                elif event.key == pygame.K_F10:
+                    previous = presenter.cycle_mode()
+                    print(f"🖼️ {previous} -> режим {presenter.mode}")
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
                 else:
                     game_manager.handle_event(event)
             else:
                 game_manager.handle_event(event)
 
-        dt = clock.tick(FPS) / 1000.0
-        game_manager.update(dt)
-        game_manager.render()
+        profiler.mark("events")
+        music.update()
+        profiler.mark("music")
 
-        screen_w, screen_h = screen.get_size()
-        game_w, game_h = game_surface.get_size()
-        scale = min(screen_w / game_w, screen_h / game_h)
-        scaled_w = int(game_w * scale)
-        scaled_h = int(game_h * scale)
-        offset_x = (screen_w - scaled_w) // 2
-        offset_y = (screen_h - scaled_h) // 2
+        frame_time = clock.tick(RENDER_FPS) / 1000.0
+        profiler.mark("wait")
+        for _ in range(timestep.advance(frame_time)):
+            game_manager.update(timestep.step)
+        profiler.mark("update")
+        game_manager.render(timestep.alpha)
+        profiler.render(game_surface)
+        profiler.mark("overlay")
 
-        screen.fill((0, 0, 0))
-        scaled_surface = pygame.transform.smoothscale(game_surface, (scaled_w, scaled_h))
-        screen.blit(scaled_surface, (offset_x, offset_y))
+        presenter.present(game_surface)
+        profiler.mark("scale")
         pygame.display.flip()
+        profiler.mark("flip")
 
+    music.stop()
     pygame.quit()
     sys.exit()
 
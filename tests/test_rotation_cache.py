@@ -0,0 +1,31 @@
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from game.constants import *
+from game.assets import AssetManager
+from game.rotation_cache import RotationCache
+
+
+def mask_counts(path):
+    sprite = AssetManager().scaled(path, (BARBIE_SIZE, BARBIE_SIZE))
+    cache = RotationCache(sprite).build_all()
+    return [mask.count() for mask, _, _ in cache.masks]
+
+
+def test_masks_match_with_and_without_display():
+    # Непрозрачный скин-карточка: без окна углы после поворота не должны попадать в маску
+    path = f"{IMAGES_DIR}/2.png"
+    pygame.display.quit()
+    pygame.display.init()
+    headless = mask_counts(path)
+
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    try:
+        windowed = mask_counts(path)
+    finally:
+        pygame.display.quit()
+
+    assert headless == windowed